@@ -25,6 +25,9 @@ setup(
             'isort>=5.12.0',
             'mypy>=1.0.0',
         ],
+        'parquet': [
+            'pyarrow>=12.0.0',
+        ],
         'notebooks': [
             'jupyter>=1.0.0',
             'ipykernel>=6.0.0',
@@ -8,10 +8,13 @@ Visualisieren der REWE Copilot Hitlisten-Daten.
 __version__ = "0.1.0"
 
 from rewe.data import (
+    GroupSizes,
     load_hitlisten_tables,
+    load_hitlisten_workbook,
     transpose_group_table,
     analyze_group_sizes,
     aggregate_groups,
+    table_to_long_format,
 )
 
 from rewe.statistics import (
@@ -19,12 +22,36 @@ from rewe.statistics import (
     power_analysis,
     print_power_analysis,
     print_group_analysis,
+    time_bin_edges,
+    fit_interval_censored,
+    fit_time_distributions,
 )
 
 from rewe.visualization import (
     set_style,
     plot_group_comparison,
     print_comparison_stats,
+    plot_question_overview,
+)
+
+from rewe.incremental import (
+    CountState,
+)
+
+from rewe.microdata import (
+    build_hitlisten_tables,
+)
+
+from rewe.storage import (
+    hitlisten_to_long_format,
+    write_processed_dataset,
+    read_processed_dataset,
+)
+
+from rewe.validation import (
+    HitlistenValidationError,
+    HitlistenValidationWarning,
+    validate_hitlisten_tables,
 )
 
 from rewe.utils import (
@@ -35,19 +62,38 @@ from rewe.utils import (
 
 __all__ = [
     # Datenverarbeitung
+    'GroupSizes',
     'load_hitlisten_tables',
+    'load_hitlisten_workbook',
     'transpose_group_table',
     'analyze_group_sizes',
     'aggregate_groups',
+    'table_to_long_format',
     # Statistik
     'calculate_power',
     'power_analysis',
     'print_power_analysis',
     'print_group_analysis',
+    'time_bin_edges',
+    'fit_interval_censored',
+    'fit_time_distributions',
     # Visualisierung
     'set_style',
     'plot_group_comparison',
     'print_comparison_stats',
+    'plot_question_overview',
+    # Inkrementelle Zählstände
+    'CountState',
+    # Rohdaten
+    'build_hitlisten_tables',
+    # Speicherung
+    'hitlisten_to_long_format',
+    'write_processed_dataset',
+    'read_processed_dataset',
+    # Validierung
+    'HitlistenValidationError',
+    'HitlistenValidationWarning',
+    'validate_hitlisten_tables',
     # Hilfsfunktionen
     'get_project_root',
     'load_environment',
@@ -9,10 +9,22 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
+from typing import Iterator, Mapping, Sequence
 
+import numpy as np
 import pandas as pd
 
 from rewe.utils import get_project_root
+from rewe.validation import (
+    REPORT_COLUMNS,
+    VALIDATION_MODES,
+    check_hitlisten_tables,
+    report_violations,
+    validate_hitlisten_tables,
+)
+
+CATEGORY_COLUMN = "category"
+RESPONSES_COLUMN = "Anzahl Antworten"
 
 
 def load_hitlisten_tables(
@@ -21,6 +33,8 @@ def load_hitlisten_tables(
     data_dir: Path | None = None,
     header_row_span: tuple[int, int] = (2, 20),
     expected_tables: int = 6,
+    sheet_name: str | int = 0,
+    validation: str | None = "warn",
 ) -> list[pd.DataFrame]:
     """
     Lädt und teilt die REWE Copilot Hitlisten-Arbeitsmappe in mehrere Tabellen.
@@ -38,6 +52,14 @@ def load_hitlisten_tables(
             ``stop`` ist exklusiv. Standard ``(2, 20)`` erfasst Excel-Zeilen 3–20.
         expected_tables: Erwartete Anzahl Tabellen in der Arbeitsmappe.
             Wird zur Strukturprüfung verwendet.
+        sheet_name: Zu ladendes Arbeitsblatt (Name oder Index). Standard ist
+            das erste Blatt. Für mehrere Blätter ``load_hitlisten_workbook``
+            verwenden.
+        validation: Konsistenzprüfung nach dem Laden: ``"warn"`` (Standard,
+            ``HitlistenValidationWarning`` bei Verstößen), ``"strict"``
+            (Abbruch) oder ``None`` (keine Prüfung). Der Verstoßbericht ist
+            über ``.report`` der Warnung bzw. des Fehlers erreichbar, siehe
+            ``rewe.validation.validate_hitlisten_tables``.
 
     Returns:
         Liste von DataFrames in der Reihenfolge wie in der Arbeitsmappe.
@@ -48,8 +70,124 @@ def load_hitlisten_tables(
         FileNotFoundError: Wenn die Excel-Datei nicht gefunden wird.
         ValueError: Wenn Kopfzeilen nicht abgeleitet werden können oder sich
             das Arbeitsmappen-Layout geändert hat.
+        HitlistenValidationError: Wenn ``validation="strict"`` und die
+            Tabellen Konsistenzverstöße enthalten.
     """
+    excel_path = _resolve_excel_path(filename, data_dir)
+    _check_header_row_span(header_row_span)
+    _check_validation_mode(validation)
+
+    # Excel-Datei ohne Kopfzeile laden
+    raw = pd.read_excel(excel_path, sheet_name=sheet_name, header=None)
+
+    tables = _split_hitlisten_tables(raw, header_row_span, expected_tables)
+    check_hitlisten_tables(tables, validation)
+    return tables
 
+
+def load_hitlisten_workbook(
+    filename: str = "REWE_Copilot_2025_Hitlisten_251105.xlsx",
+    *,
+    data_dir: Path | None = None,
+    sheet_names: Sequence[str] | None = None,
+    header_row_span: tuple[int, int] = (2, 20),
+    expected_tables: int | None = 6,
+    sheet_options: Mapping[str, Mapping] | None = None,
+    validation: str | None = "warn",
+) -> dict[str, list[pd.DataFrame]]:
+    """
+    Lädt alle Hitlisten-Arbeitsblätter einer Arbeitsmappe.
+
+    Die Arbeitsmappe wird genau einmal geöffnet, und alle Blätter werden
+    nacheinander über dieses eine Dateihandle eingelesen, statt die Datei für
+    jedes Blatt erneut zu öffnen und zu entpacken. Ohne ``sheet_names``
+    werden alle Blätter mit Hitlisten-Layout (Kopfzeilen mit Fragennummern
+    wie ``Fr. 5``) automatisch erkannt, andere Blätter werden übersprungen.
+
+    Args:
+        filename: Excel-Dateiname relativ zu ``data/raw``, falls ``data_dir`` nicht
+            angegeben ist.
+        data_dir: Optionales Verzeichnis, das ``filename`` enthält.
+        sheet_names: Optionale Liste zu ladender Blätter. Diese werden ohne
+            Layout-Erkennung geladen.
+        header_row_span: Standard-Kopfzeilenbereich ``(start, stop)`` für alle
+            Blätter, siehe ``load_hitlisten_tables``.
+        expected_tables: Standard-Anzahl Tabellen pro Blatt. ``None`` deaktiviert
+            die Prüfung.
+        sheet_options: Optionale Überschreibungen pro Blattname, z.B.
+            ``{"Alter": {"expected_tables": 2, "header_row_span": (1, 19)}}``.
+            Bei expliziten ``sheet_names`` sind nur Blätter aus dieser Liste
+            erlaubt.
+        validation: Konsistenzprüfung aller Blätter, siehe
+            ``load_hitlisten_tables``. Verstöße werden gesammelt gemeldet;
+            der Bericht enthält zusätzlich die Spalte ``sheet``.
+
+    Returns:
+        Dictionary ``{Blattname: Liste von Tabellen}`` in Reihenfolge der
+        Arbeitsmappe.
+
+    Raises:
+        FileNotFoundError: Wenn die Excel-Datei nicht gefunden wird.
+        ValueError: Wenn ein Blatt fehlt, eine Überschreibung ungültig ist
+            oder ein nicht geladenes Blatt betrifft,
+            kein Blatt dem Hitlisten-Layout entspricht oder sich das Layout
+            eines Blatts geändert hat.
+        HitlistenValidationError: Wenn ``validation="strict"`` und ein Blatt
+            Konsistenzverstöße enthält. Die Meldung nennt die betroffenen
+            Blätter.
+    """
+    excel_path = _resolve_excel_path(filename, data_dir)
+    _check_validation_mode(validation)
+
+    _check_header_row_span(header_row_span)
+    defaults = {"header_row_span": header_row_span, "expected_tables": expected_tables}
+    options: dict[str, dict] = {}
+    for name, overrides in (sheet_options or {}).items():
+        unknown = set(overrides) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unbekannte Optionen für Blatt '{name}': {sorted(unknown)}")
+        options[name] = {**defaults, **overrides}
+        _check_header_row_span(options[name]["header_row_span"])
+
+    if sheet_names is not None:
+        unused = [name for name in options if name not in sheet_names]
+        if unused:
+            raise ValueError(f"Optionen für nicht geladene Arbeitsblätter: {unused}")
+
+    # Arbeitsmappe einmal öffnen und alle Blätter in einem Durchgang lesen
+    with pd.ExcelFile(excel_path) as workbook:
+        available = workbook.sheet_names
+        names = available if sheet_names is None else list(sheet_names)
+        missing = [name for name in [*names, *options] if name not in available]
+        if missing:
+            raise ValueError(f"Arbeitsblätter nicht gefunden: {missing}")
+        raw_sheets = workbook.parse(sheet_name=names, header=None)
+
+    sheets: dict[str, list[pd.DataFrame]] = {}
+    for name in names:
+        sheet = options.get(name, defaults)
+        raw = raw_sheets[name]
+        if sheet_names is None and not _has_hitlisten_layout(raw, sheet["header_row_span"]):
+            continue
+        sheets[name] = _split_hitlisten_tables(raw, **sheet)
+    if not sheets:
+        raise ValueError(f"Kein Arbeitsblatt mit Hitlisten-Layout gefunden in {excel_path}")
+
+    if validation is not None:
+        # Verstöße aller Blätter in einem Bericht mit Blattnamen sammeln
+        reports = [
+            validate_hitlisten_tables(tables).assign(sheet=name)
+            for name, tables in sheets.items()
+        ]
+        reports = [r for r in reports if len(r)]
+        if reports:
+            report = pd.concat(reports, ignore_index=True)
+            report_violations(report[["sheet", *REPORT_COLUMNS]], validation)
+    return sheets
+
+
+def _resolve_excel_path(filename: str, data_dir: Path | None) -> Path:
+    """Bestimmt den Pfad zur Excel-Datei und prüft, ob sie existiert."""
     if data_dir is None:
         data_dir = get_project_root() / "data" / "raw"
 
@@ -57,13 +195,38 @@ def load_hitlisten_tables(
 
     if not excel_path.exists():
         raise FileNotFoundError(f"Excel-Datei nicht gefunden: {excel_path}")
+    return excel_path
+
 
+def _check_header_row_span(header_row_span: tuple[int, int]) -> None:
+    """Prüft, dass ``header_row_span`` ein gültiger Bereich ist."""
     header_start, header_stop = header_row_span
     if header_start < 0 or header_stop <= header_start:
         raise ValueError("header_row_span muss ein Tupel aus Ganzzahlen sein, wobei start < stop")
 
-    # Excel-Datei ohne Kopfzeile laden
-    raw = pd.read_excel(excel_path, header=None)
+
+def _check_validation_mode(validation: str | None) -> None:
+    """Prüft den Validierungsmodus vor dem (teuren) Laden."""
+    if validation not in VALIDATION_MODES:
+        raise ValueError(f"validation muss einer von {VALIDATION_MODES} sein")
+
+
+def _has_hitlisten_layout(raw: pd.DataFrame, header_row_span: tuple[int, int]) -> bool:
+    """Prüft, ob ein Blatt Daten und Kopfzeilen mit Fragennummern enthält."""
+    header_start, header_stop = header_row_span
+    if len(raw) <= header_stop:
+        return False
+    headers = _build_headers(raw.iloc[header_start:header_stop])
+    return any(re.search(r"Fr\.\s*\d+", header) for header in headers)
+
+
+def _split_hitlisten_tables(
+    raw: pd.DataFrame,
+    header_row_span: tuple[int, int],
+    expected_tables: int | None,
+) -> list[pd.DataFrame]:
+    """Teilt ein ohne Kopfzeile geladenes Blatt in bereinigte Tabellen."""
+    header_start, header_stop = header_row_span
 
     # Kopfzeilen erstellen und kombinieren
     header_rows = raw.iloc[header_start:header_stop]
@@ -71,7 +234,7 @@ def load_hitlisten_tables(
     if not headers:
         raise ValueError("Konnte keine Spaltenkopfzeilen aus der Arbeitsmappe erstellen.")
     if not headers[0]:
-        headers[0] = "category"
+        headers[0] = CATEGORY_COLUMN
 
     # Datenteil extrahieren
     data = raw.iloc[header_stop:].copy().reset_index(drop=True)
@@ -90,7 +253,7 @@ def load_hitlisten_tables(
     if start_idx < len(data):
         tables.append(data.iloc[start_idx:].copy())
 
-    if len(tables) != expected_tables:
+    if expected_tables is not None and len(tables) != expected_tables:
         raise ValueError(
             f"Arbeitsmappen-Struktur geändert: erwartet {expected_tables} Tabellen, "
             f"gefunden {len(tables)}"
@@ -168,6 +331,170 @@ def transpose_group_table(table: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]
     return transposed, group_names
 
 
+def table_to_long_format(table: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    Wandelt eine Hitlisten-Tabelle vom Wide- ins Long-Format um.
+
+    Die erste Spalte enthält die Kategorien, die zweite Spalte die Anzahl
+    Antworten je Kategorie, alle weiteren Spalten sind Fragen.
+
+    Args:
+        table: Bereinigte Tabelle aus ``load_hitlisten_tables``
+
+    Returns:
+        Tupel aus (Long-Format-DataFrame mit den Spalten ``Question``,
+        ``Category``, ``Value``, ``Question_Number`` und ``Relative_Value``,
+        Dictionary mit Anzahl Antworten je Kategorie)
+    """
+    categories = table.iloc[:, 0].astype(str).to_numpy()
+    responses = pd.to_numeric(table.iloc[:, 1], errors="coerce").to_numpy(dtype=float)
+    questions = np.asarray(table.columns[2:], dtype=object)
+    values = table.iloc[:, 2:].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+    # Zeilenweise (Kategorie für Kategorie) entfalten, wie pd.melt auf der Transponierten
+    n_questions = len(questions)
+    long = pd.DataFrame({
+        'Question': np.tile(questions, len(categories)),
+        'Category': np.repeat(categories, n_questions),
+        'Value': values.ravel(),
+    })
+    long['Question_Number'] = long['Question'].str.extract(r'(Fr\.\s*\d+)', expand=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        long['Relative_Value'] = long['Value'].to_numpy() / np.repeat(responses, n_questions)
+
+    response_counts = {
+        category: None if np.isnan(n) else int(n)
+        for category, n in zip(categories, responses)
+    }
+    return long, response_counts
+
+
+class GroupSizes:
+    """
+    Kompakte, array-basierte Darstellung von Gruppengrößen.
+
+    Speichert Gruppennamen zusammen mit einem NumPy-Array der Größen und einer
+    Maske für fehlende Werte. Die absteigende Sortierreihenfolge wird einmalig
+    beim Erstellen berechnet, sodass Analyse-, Statistik- und Plotfunktionen
+    nicht erneut filtern und sortieren müssen.
+
+    Ganzzahlige Größen werden als ``int64`` gespeichert, nicht ganzzahlige
+    bleiben als ``float64`` erhalten (wie bei Dictionaries bisher). Nicht
+    endliche Größen (``nan``, ``inf``) gelten als fehlend.
+
+    Args:
+        names: Gruppennamen in Originalreihenfolge
+        sizes: Gruppengrößen (fehlende Einträge werden ignoriert)
+        missing: Optionale boolesche Maske für fehlende Gruppengrößen
+    """
+
+    __slots__ = ("names", "sizes", "missing", "order", "_index")
+
+    def __init__(self, names, sizes, missing=None) -> None:
+        self.names = tuple(names)
+        sizes = np.asarray(sizes, dtype=float).copy()
+        if missing is None:
+            missing = np.zeros(len(self.names), dtype=bool)
+        missing = np.asarray(missing, dtype=bool)
+        if sizes.shape != (len(self.names),) or missing.shape != sizes.shape:
+            raise ValueError("names, sizes und missing müssen dieselbe Länge haben")
+
+        missing = missing | ~np.isfinite(sizes)
+        sizes[missing] = 0
+        if np.array_equal(sizes, np.trunc(sizes)):
+            sizes = sizes.astype(np.int64)
+        self.sizes = sizes
+        self.missing = missing
+
+        # Absteigend nach Größe sortieren, bei Gleichstand stabil
+        valid = np.flatnonzero(~missing)
+        self.order = valid[np.argsort(-sizes[valid], kind="stable")]
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_mapping(cls, group_sizes: Mapping) -> "GroupSizes":
+        """
+        Erstellt ``GroupSizes`` aus einem Dictionary ``{Gruppe: Größe oder None}``.
+
+        Nicht numerische und nicht endliche Werte (z.B. ``nan`` aus
+        ``Series.to_dict()``) gelten wie in ``analyze_group_sizes`` als fehlend.
+        """
+        names = list(group_sizes.keys())
+        raw = pd.Series([group_sizes[g] for g in names], dtype=object)
+        values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+        missing = ~np.isfinite(values)
+        return cls(names, np.where(missing, 0, values), missing)
+
+    @classmethod
+    def coerce(cls, group_sizes: "GroupSizes | Mapping") -> "GroupSizes":
+        """Gibt ``group_sizes`` als ``GroupSizes`` zurück (Dictionaries werden konvertiert)."""
+        if isinstance(group_sizes, cls):
+            return group_sizes
+        return cls.from_mapping(group_sizes)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._index
+
+    def __getitem__(self, name) -> int | float | None:
+        idx = self._index[name]
+        return None if self.missing[idx] else self.sizes[idx].item()
+
+    def __iter__(self) -> Iterator:
+        return iter(self.names)
+
+    def __repr__(self) -> str:
+        return f"GroupSizes({self.to_dict()!r})"
+
+    def items(self) -> list[tuple]:
+        """Gibt ``(Name, Größe oder None)``-Paare in Originalreihenfolge zurück."""
+        return list(self.to_dict().items())
+
+    def to_dict(self) -> dict:
+        """Konvertiert in ein Dictionary ``{Gruppe: Größe oder None}``."""
+        return {
+            name: None if missing else size.item()
+            for name, size, missing in zip(self.names, self.sizes, self.missing)
+        }
+
+    @property
+    def valid_sizes(self) -> np.ndarray:
+        """Größen aller Gruppen ohne fehlende Werte, in Originalreihenfolge."""
+        return self.sizes[~self.missing]
+
+    @property
+    def sorted_names(self) -> list:
+        """Gruppennamen absteigend nach Größe (ohne fehlende Werte)."""
+        return [self.names[i] for i in self.order]
+
+    @property
+    def sorted_sizes(self) -> np.ndarray:
+        """Gruppengrößen absteigend sortiert (ohne fehlende Werte)."""
+        return self.sizes[self.order]
+
+    @property
+    def total(self) -> int | float:
+        """Summe aller vorhandenen Gruppengrößen."""
+        return self.valid_sizes.sum().item()
+
+    def sorted_items(self) -> list[tuple]:
+        """Gibt ``(Name, Größe)``-Paare absteigend nach Größe zurück."""
+        return [(self.names[i], self.sizes[i].item()) for i in self.order]
+
+    def small_mask(self, threshold: int = 30) -> np.ndarray:
+        """Boolesche Maske der vorhandenen Gruppen mit n < threshold."""
+        return ~self.missing & (self.sizes < threshold)
+
+    def small_groups(self, threshold: int = 30) -> list[tuple]:
+        """Gibt ``(Name, Größe)``-Paare der Gruppen mit n < threshold zurück."""
+        return [
+            (self.names[i], self.sizes[i].item())
+            for i in np.flatnonzero(self.small_mask(threshold))
+        ]
+
+
 def analyze_group_sizes(
     transposed_table: pd.DataFrame, 
     group_names: list[str],
@@ -187,40 +514,33 @@ def analyze_group_sizes(
         - 'total': Gesamtzahl der Antworten
         - 'small_groups': Liste der Gruppen mit n < threshold
         - 'sorted': Nach Größe sortierte Liste von (name, size) Tupeln
+        - 'groups': ``GroupSizes``-Objekt für die Weiterverarbeitung
     """
     first_row = transposed_table.iloc[0]
-    
-    sizes = {}
-    for group in group_names:
-        try:
-            sizes[group] = int(float(first_row[group]))
-        except (ValueError, TypeError):
-            sizes[group] = None
-    
-    # Sortieren nach Größe
-    sorted_groups = sorted(
-        [(g, s) for g, s in sizes.items() if s is not None],
-        key=lambda x: x[1],
-        reverse=True
-    )
-    
-    total = sum(s for s in sizes.values() if s is not None)
-    small_groups = [(g, s) for g, s in sizes.items() if s is not None and s < threshold]
-    
+
+    # Gruppengrößen in einem Schritt numerisch konvertieren
+    raw = pd.Series([first_row[group] for group in group_names], dtype=object)
+    values = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=float)
+    missing = ~np.isfinite(values)
+    sizes = np.trunc(np.where(missing, 0, values)).astype(np.int64)
+
+    groups = GroupSizes(group_names, sizes, missing)
+
     return {
-        'sizes': sizes,
-        'total': total,
-        'small_groups': small_groups,
-        'sorted': sorted_groups
+        'sizes': groups.to_dict(),
+        'total': groups.total,
+        'small_groups': groups.small_groups(threshold),
+        'sorted': groups.sorted_items(),
+        'groups': groups,
     }
 
 
-def aggregate_groups(group_sizes: dict, aggregation_mapping: dict) -> dict:
+def aggregate_groups(group_sizes: GroupSizes | dict, aggregation_mapping: dict) -> dict:
     """
     Aggregiert Gruppen gemäß einer Zuordnung.
     
     Args:
-        group_sizes: Dictionary mit Gruppennamen und Größen
+        group_sizes: ``GroupSizes`` oder Dictionary mit Gruppennamen und Größen
         aggregation_mapping: Dictionary, das Original-Gruppennamen auf
             aggregierte Gruppennamen mappt
             
@@ -0,0 +1,313 @@
+"""
+Inkrementelle Zählstände für das Rewe-Projekt.
+
+Dieses Modul enthält einen speicherbaren, zusammenführbaren Zählstand für eine
+Hitlisten-Tabelle: Häufigkeiten je (Frage, Antwort, Kategorie) sowie die
+Gruppengröße n je Kategorie. Neue Datenstände werden addiert, veraltete
+subtrahiert; abgeleitete Größen werden nur für die betroffenen Kategorien
+neu berechnet.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from rewe.data import CATEGORY_COLUMN, RESPONSES_COLUMN, GroupSizes
+from rewe.statistics import _summarize_powers, calculate_power
+
+
+class CountState:
+    """
+    Zusammenführbarer Zählstand einer Hitlisten-Tabelle.
+
+    Speichert ein Array ``counts`` (Kategorien × Frage-Antwort-Spalten) und
+    ein Array ``n`` mit der Anzahl Antworten je Kategorie. ``add`` und
+    ``subtract`` kosten O(Delta): nur die Zeilen und Spalten des Deltas werden
+    verändert, und relative Werte, verfolgte Aggregationen sowie zwischen-
+    gespeicherte Power-Werte werden nur für diese Kategorien aktualisiert.
+
+    Args:
+        categories: Kategorienamen
+        columns: Frage-Antwort-Spalten, z.B. ``"Fr. 3 - bis 10 Minuten"``
+        counts: Häufigkeiten mit Form ``(len(categories), len(columns))``
+        n: Anzahl Antworten je Kategorie
+    """
+
+    __slots__ = (
+        "categories", "columns", "counts", "n",
+        "_category_index", "_column_index", "_relative", "_powers", "_aggregations",
+    )
+
+    def __init__(
+        self,
+        categories: Sequence[str] = (),
+        columns: Sequence[str] = (),
+        counts=None,
+        n=None,
+    ) -> None:
+        self.categories = list(categories)
+        self.columns = list(columns)
+        shape = (len(self.categories), len(self.columns))
+        self.counts = (
+            np.zeros(shape, dtype=np.int64) if counts is None
+            else np.array(counts, dtype=np.int64)
+        )
+        self.n = np.zeros(shape[0], dtype=np.int64) if n is None else np.array(n, dtype=np.int64)
+        if self.counts.shape != shape or self.n.shape != shape[:1]:
+            raise ValueError("counts und n passen nicht zu categories und columns")
+        if len(set(self.categories)) != shape[0] or len(set(self.columns)) != shape[1]:
+            raise ValueError("Kategorien und Spalten müssen eindeutig sein")
+
+        self._category_index = {c: i for i, c in enumerate(self.categories)}
+        self._column_index = {c: i for i, c in enumerate(self.columns)}
+        self._relative = None
+        self._powers: dict[tuple[float, float], np.ndarray] = {}
+        self._aggregations: dict[str, tuple[dict, CountState]] = {}
+
+    @classmethod
+    def from_table(cls, table: pd.DataFrame) -> "CountState":
+        """
+        Erstellt einen Zählstand aus einer Tabelle im Format von ``load_hitlisten_tables``.
+
+        Fehlende Werte (z.B. ``"-"`` in der Arbeitsmappe) zählen als 0.
+        """
+        values = table.iloc[:, 1:].apply(pd.to_numeric, errors="coerce").fillna(0)
+        values = values.groupby(table.iloc[:, 0].astype(str).to_numpy(), sort=False).sum()
+        return cls(
+            categories=values.index.tolist(),
+            columns=[str(c) for c in values.columns[1:]],
+            counts=np.rint(values.iloc[:, 1:].to_numpy()),
+            n=np.rint(values.iloc[:, 0].to_numpy()),
+        )
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __repr__(self) -> str:
+        return (
+            f"CountState({len(self.categories)} Kategorien, "
+            f"{len(self.columns)} Spalten, n={int(self.n.sum())})"
+        )
+
+    def copy(self) -> "CountState":
+        """Gibt eine Kopie ohne verfolgte Aggregationen und Caches zurück."""
+        return CountState(self.categories, self.columns, self.counts, self.n)
+
+    # ------------------------------------------------------------------
+    # Zusammenführen
+    # ------------------------------------------------------------------
+
+    def add(self, delta: "CountState | pd.DataFrame") -> "CountState":
+        """
+        Addiert einen neuen Datenstand (Zählstand oder Tabelle) in-place.
+
+        Raises:
+            ValueError: Wenn das Delta negative Zählwerte enthält
+        """
+        return self._apply(delta, sign=1)
+
+    def subtract(self, delta: "CountState | pd.DataFrame") -> "CountState":
+        """
+        Subtrahiert einen veralteten Datenstand in-place.
+
+        Raises:
+            ValueError: Wenn das Delta negative Zählwerte enthält, Kategorien
+                oder Spalten des Deltas fehlen oder Zählwerte negativ würden
+        """
+        return self._apply(delta, sign=-1)
+
+    def __iadd__(self, delta):
+        return self.add(delta)
+
+    def __isub__(self, delta):
+        return self.subtract(delta)
+
+    def _apply(self, delta, sign: int) -> "CountState":
+        if not isinstance(delta, CountState):
+            delta = CountState.from_table(delta)
+        operation = "Addition" if sign > 0 else "Subtraktion"
+
+        # Delta vollständig prüfen, bevor der Zählstand verändert wird
+        if (delta.counts < 0).any() or (delta.n < 0).any():
+            raise ValueError(f"{operation}: Delta enthält negative Zählwerte")
+        if sign < 0:
+            unknown = [c for c in delta.categories if c not in self._category_index]
+            unknown += [c for c in delta.columns if c not in self._column_index]
+            if unknown:
+                raise ValueError(
+                    f"{operation}: Delta enthält unbekannte Kategorien/Spalten: {unknown[:5]}"
+                )
+            rows = np.array([self._category_index[c] for c in delta.categories], dtype=np.intp)
+            cols = np.array([self._column_index[c] for c in delta.columns], dtype=np.intp)
+            block = np.ix_(rows, cols)
+            if (self.counts[block] < delta.counts).any() or (self.n[rows] < delta.n).any():
+                raise ValueError(f"{operation} ergibt negative Zählwerte")
+        else:
+            rows = self._indices(delta.categories, self._category_index, self.categories)
+            cols = self._indices(delta.columns, self._column_index, self.columns)
+            self._grow()
+            block = np.ix_(rows, cols)
+
+        self.counts[block] += sign * delta.counts
+        self.n[rows] += sign * delta.n
+
+        self._refresh(rows)
+        for mapping, aggregated in self._aggregations.values():
+            aggregated._apply(delta.aggregate(mapping), sign)
+        return self
+
+    @staticmethod
+    def _indices(labels: Sequence[str], index: dict, ordered: list) -> np.ndarray:
+        """Bestimmt Zeilen-/Spaltenpositionen und ergänzt neue Labels."""
+        positions = np.empty(len(labels), dtype=np.intp)
+        for i, label in enumerate(labels):
+            if label not in index:
+                index[label] = len(ordered)
+                ordered.append(label)
+            positions[i] = index[label]
+        return positions
+
+    def _grow(self) -> None:
+        """Vergrößert die Arrays, falls neue Kategorien oder Spalten hinzukamen."""
+        rows, cols = self.counts.shape
+        extra_rows, extra_cols = len(self.categories) - rows, len(self.columns) - cols
+        if extra_rows or extra_cols:
+            self.counts = np.pad(self.counts, ((0, extra_rows), (0, extra_cols)))
+            self.n = np.pad(self.n, (0, extra_rows))
+            if self._relative is not None:
+                self._relative = np.pad(
+                    self._relative, ((0, extra_rows), (0, extra_cols)), constant_values=np.nan
+                )
+                if extra_cols:
+                    # Neue Spalten betreffen alle Kategorien
+                    self._refresh(np.arange(len(self.categories)))
+            for key, powers in self._powers.items():
+                self._powers[key] = np.pad(powers, (0, extra_rows))
+
+    def _refresh(self, rows: np.ndarray) -> None:
+        """Aktualisiert zwischengespeicherte Werte nur für die Zeilen ``rows``."""
+        if self._relative is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                relative = self.counts[rows] / self.n[rows, None]
+            self._relative[rows] = np.where(self.n[rows, None] > 0, relative, np.nan)
+        for (effect_size, alpha), powers in self._powers.items():
+            powers[rows] = calculate_power(self.n[rows], effect_size, alpha)
+
+    # ------------------------------------------------------------------
+    # Abgeleitete Größen
+    # ------------------------------------------------------------------
+
+    def group_sizes(self) -> GroupSizes:
+        """Gibt die Gruppengrößen zurück; Kategorien mit n = 0 gelten als fehlend."""
+        return GroupSizes(self.categories, self.n, self.n == 0)
+
+    def relative_values(self) -> pd.DataFrame:
+        """
+        Gibt relative Werte (Häufigkeit / n) als DataFrame zurück.
+
+        Beim ersten Aufruf vollständig berechnet, danach bei jedem ``add``
+        bzw. ``subtract`` nur für die betroffenen Kategorien aktualisiert.
+        Der zurückgegebene DataFrame ist eine Kopie des internen Caches.
+        """
+        if self._relative is None:
+            self._relative = np.full(self.counts.shape, np.nan)
+            self._refresh(np.arange(len(self.categories)))
+        return pd.DataFrame(
+            self._relative.copy(), index=self.categories, columns=self.columns
+        )
+
+    def power_analysis(self, effect_size: float = 0.5, alpha: float = 0.05) -> dict:
+        """
+        Führt die Power-Analyse im Format von ``power_analysis`` durch.
+
+        Power-Werte werden je ``(effect_size, alpha)`` zwischengespeichert und
+        bei Änderungen nur für die betroffenen Kategorien neu berechnet.
+        """
+        key = (effect_size, alpha)
+        if key not in self._powers:
+            self._powers[key] = calculate_power(self.n, effect_size, alpha)
+        valid = np.flatnonzero(self.n > 0)
+        return _summarize_powers([self.categories[i] for i in valid], self._powers[key][valid])
+
+    def aggregate(self, mapping: Mapping[str, str]) -> "CountState":
+        """
+        Fasst Kategorien gemäß ``mapping`` (Original → aggregiert) zusammen.
+
+        Kategorien ohne Eintrag in ``mapping`` werden ausgelassen.
+        """
+        targets = list(dict.fromkeys(
+            mapping[c] for c in self.categories if c in mapping
+        ))
+        target_index = {t: i for i, t in enumerate(targets)}
+        rows = [i for i, c in enumerate(self.categories) if c in mapping]
+        codes = np.array([target_index[mapping[self.categories[i]]] for i in rows], dtype=np.intp)
+
+        counts = np.zeros((len(targets), len(self.columns)), dtype=np.int64)
+        n = np.zeros(len(targets), dtype=np.int64)
+        np.add.at(counts, codes, self.counts[rows])
+        np.add.at(n, codes, self.n[rows])
+        return CountState(targets, self.columns, counts, n)
+
+    def track_aggregation(self, name: str, mapping: Mapping[str, str]) -> "CountState":
+        """
+        Registriert eine Aggregation, die bei ``add``/``subtract`` mitgeführt wird.
+
+        Args:
+            name: Bezeichnung der Aggregation
+            mapping: Zuordnung Original-Kategorie → aggregierte Kategorie
+
+        Returns:
+            Aggregierter Zählstand, der inkrementell aktualisiert wird
+        """
+        mapping = dict(mapping)
+        aggregated = self.aggregate(mapping)
+        self._aggregations[name] = (mapping, aggregated)
+        return aggregated
+
+    def aggregation(self, name: str) -> "CountState":
+        """Gibt eine mit ``track_aggregation`` registrierte Aggregation zurück."""
+        return self._aggregations[name][1]
+
+    def to_table(self) -> pd.DataFrame:
+        """Gibt den Zählstand im Format von ``load_hitlisten_tables`` zurück."""
+        table = pd.DataFrame(self.counts, columns=self.columns)
+        table.insert(0, RESPONSES_COLUMN, self.n)
+        table.insert(0, CATEGORY_COLUMN, self.categories)
+        return table
+
+    # ------------------------------------------------------------------
+    # Speicherung
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> Path:
+        """
+        Speichert den Zählstand als ``.npz``-Datei.
+
+        Verfolgte Aggregationen und Caches werden nicht gespeichert.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            np.savez_compressed(
+                file,
+                categories=np.array(self.categories, dtype=str),
+                columns=np.array(self.columns, dtype=str),
+                counts=self.counts,
+                n=self.n,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CountState":
+        """Lädt einen mit ``save`` gespeicherten Zählstand."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls(
+                data["categories"].tolist(),
+                data["columns"].tolist(),
+                data["counts"],
+                data["n"],
+            )
@@ -0,0 +1,234 @@
+"""
+Aufbau von Hitlisten-Tabellen aus Befragten-Rohdaten für das Rewe-Projekt.
+
+Dieses Modul liest den Rohdaten-Export (eine Zeile pro befragter Person) als
+CSV oder Parquet in Blöcken, kodiert Antworten und Kategorien als Ganzzahlen
+und zählt sie mit ``np.bincount``. Der Speicherbedarf hängt nur von der Anzahl
+Kategorien und Antwortoptionen ab, nicht von der Anzahl Befragter.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Collection, Iterator, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from rewe.data import CATEGORY_COLUMN, RESPONSES_COLUMN
+
+TOTAL_LABEL = "Gesamt"
+
+
+class _Vocabulary:
+    """Ordnet Werten fortlaufende Ganzzahl-Codes zu (in Reihenfolge des Auftretens)."""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self, values: Sequence[str] = ()) -> None:
+        self.values = list(dict.fromkeys(values))
+        self._index = pd.Index(self.values, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, column: pd.Series, grow: bool = True) -> np.ndarray:
+        """Gibt Codes für ``column`` zurück, fehlende Werte erhalten -1."""
+        if grow:
+            unseen = pd.Index(column.dropna().unique()).difference(self._index, sort=False)
+            if len(unseen):
+                self.values.extend(unseen.tolist())
+                self._index = pd.Index(self.values, dtype=object)
+        return self._index.get_indexer(column)
+
+
+class _CountGrid:
+    """Zählt Antworten je Kategorie in einem mitwachsenden 2D-Array."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self) -> None:
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+
+    def add(self, category_codes: np.ndarray, answer_codes: np.ndarray,
+            n_categories: int, n_answers: int) -> None:
+        self._resize(n_categories, n_answers)
+        valid = (category_codes >= 0) & (answer_codes >= 0)
+        flat = category_codes[valid] * n_answers + answer_codes[valid]
+        self.counts += np.bincount(flat, minlength=n_categories * n_answers).reshape(
+            n_categories, n_answers
+        )
+
+    def _resize(self, n_categories: int, n_answers: int) -> None:
+        rows, cols = self.counts.shape
+        if (rows, cols) != (n_categories, n_answers):
+            self.counts = np.pad(self.counts, ((0, n_categories - rows), (0, n_answers - cols)))
+
+
+def _iter_chunks(
+    source: Path,
+    columns: list[str],
+    chunksize: int,
+) -> Iterator[pd.DataFrame]:
+    """
+    Liest CSV- oder Parquet-Rohdaten blockweise mit String-Spalten.
+
+    Leere Strings werden in beiden Formaten als fehlender Wert behandelt
+    (``read_csv`` macht das bereits, Parquet behält sie sonst bei). Parquet-
+    Spalten werden bereits in Arrow nach String gewandelt, damit die Labels
+    nicht davon abhängen, ob ein Block Nullwerte enthält.
+    """
+    suffix = source.suffix.lower()
+    if suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError(
+                "Zum Lesen von Parquet-Rohdaten wird 'pyarrow' benötigt: "
+                "pip install rewe[parquet]"
+            ) from exc
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            # In Arrow nach String wandeln, damit Ganzzahlspalten mit Nullwerten
+            # nicht blockabhängig als float ("1.0") gelesen werden
+            batch = pa.RecordBatch.from_arrays(
+                [pc.cast(column, pa.string()) for column in batch.columns],
+                names=batch.schema.names,
+            )
+            yield _empty_to_na(batch.to_pandas().astype("string"))
+    elif suffix in (".csv", ".txt"):
+        for chunk in pd.read_csv(
+            source, usecols=columns, dtype="string", chunksize=chunksize
+        ):
+            yield _empty_to_na(chunk)
+    else:
+        raise ValueError(f"Nicht unterstütztes Rohdatenformat: {source.suffix}")
+
+
+def _empty_to_na(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Ersetzt leere bzw. nur aus Leerzeichen bestehende Strings durch ``pd.NA``."""
+    return chunk.mask(chunk.apply(lambda col: col.str.strip() == ""), pd.NA)
+
+
+def build_hitlisten_tables(
+    source: str | Path,
+    *,
+    group_columns: Sequence[str],
+    question_columns: Mapping[str, str],
+    answers: Mapping[str, Sequence[str]] | None = None,
+    categories: Mapping[str, Sequence[str]] | None = None,
+    multi_choice: Collection[str] = (),
+    separator: str = ";",
+    include_total: bool = True,
+    chunksize: int = 100_000,
+) -> list[pd.DataFrame]:
+    """
+    Erstellt Hitlisten-Tabellen blockweise aus Befragten-Rohdaten.
+
+    Jede Gruppierungsspalte ergibt eine Tabelle mit einer Zeile pro Kategorie,
+    im selben Format wie ``load_hitlisten_tables``: Kategorie, Anzahl
+    Antworten und eine Spalte ``"<Frage> - <Antwort>"`` mit Häufigkeiten je
+    Antwortoption. Alle Werte werden als Strings verglichen.
+
+    Args:
+        source: Pfad zu einer CSV- oder Parquet-Datei
+        group_columns: Spalten mit Kategorien, z.B. ``["Gesellschaft", "Alter"]``
+        question_columns: Zuordnung Rohdatenspalte → Fragennummer, z.B.
+            ``{"q3": "Fr. 3"}``. Die Reihenfolge bestimmt die Spaltenreihenfolge.
+        answers: Optionale feste Reihenfolge der Antworten je Rohdatenspalte.
+            Antworten außerhalb dieser Liste werden ignoriert. Ohne Angabe
+            erscheinen Antworten in der Reihenfolge ihres Auftretens.
+        categories: Optionale feste Reihenfolge der Kategorien je
+            Gruppierungsspalte (unbekannte Kategorien werden ignoriert)
+        multi_choice: Fragespalten mit Mehrfachantworten, deren Antworten
+            durch ``separator`` getrennt sind
+        separator: Trennzeichen für Mehrfachantworten (Standard: ``";"``)
+        include_total: Ob eine Tabelle mit der Gesamtzeile vorangestellt wird
+        chunksize: Anzahl Zeilen pro gelesenem Block
+
+    Returns:
+        Liste von DataFrames: optional die Gesamttabelle, danach eine Tabelle
+        pro Gruppierungsspalte in der Reihenfolge von ``group_columns``
+
+    Raises:
+        FileNotFoundError: Wenn die Rohdatendatei nicht gefunden wird
+        ValueError: Bei nicht unterstütztem Dateiformat oder ungültigen Argumenten
+    """
+    source = Path(source)
+    if not source.exists():
+        raise FileNotFoundError(f"Rohdatendatei nicht gefunden: {source}")
+    if not group_columns and not include_total:
+        raise ValueError("Mindestens eine Gruppierungsspalte oder include_total erforderlich")
+    if chunksize <= 0:
+        raise ValueError("chunksize muss positiv sein")
+
+    answers = answers or {}
+    categories = categories or {}
+    unknown = set(multi_choice) - set(question_columns)
+    if unknown:
+        raise ValueError(f"Mehrfachantwort-Spalten ohne Frage: {sorted(unknown)}")
+
+    questions = list(question_columns)
+    answer_vocab = {q: _Vocabulary(answers.get(q, ())) for q in questions}
+    category_vocab = {g: _Vocabulary(categories.get(g, ())) for g in group_columns}
+    grids = {(g, q): _CountGrid() for g in group_columns for q in questions}
+    totals = {q: _CountGrid() for q in questions}
+    responses = {g: np.zeros(0, dtype=np.int64) for g in group_columns}
+    n_total = 0
+
+    columns = list(dict.fromkeys([*group_columns, *questions]))
+    for chunk in _iter_chunks(source, columns, chunksize):
+        chunk = chunk.reset_index(drop=True)
+        n_total += len(chunk)
+
+        category_codes = {}
+        for group in group_columns:
+            vocab = category_vocab[group]
+            codes = vocab.encode(chunk[group], grow=group not in categories)
+            category_codes[group] = codes
+            counts = np.bincount(codes[codes >= 0], minlength=len(vocab))
+            responses[group] = np.pad(responses[group], (0, len(vocab) - len(responses[group])))
+            responses[group] += counts
+
+        for question in questions:
+            column = chunk[question]
+            rows = np.arange(len(chunk))
+            if question in multi_choice:
+                # Mehrfachantworten aufteilen, doppelte Nennungen einer Person nur einmal zählen
+                pairs = (
+                    column.str.split(separator).explode().str.strip()
+                    .reset_index().drop_duplicates()
+                )
+                rows = pairs["index"].to_numpy()
+                column = pairs[question].replace("", pd.NA)
+
+            vocab = answer_vocab[question]
+            answer_codes = vocab.encode(column, grow=question not in answers)
+            totals[question].add(np.zeros(len(rows), dtype=np.int64), answer_codes, 1, len(vocab))
+            for group in group_columns:
+                grids[(group, question)].add(
+                    category_codes[group][rows], answer_codes,
+                    len(category_vocab[group]), len(vocab),
+                )
+
+    def to_table(labels, n, grid_for) -> pd.DataFrame:
+        data = {CATEGORY_COLUMN: list(labels), RESPONSES_COLUMN: n}
+        for question in questions:
+            vocab = answer_vocab[question]
+            grid = grid_for(question)
+            grid._resize(len(labels), len(vocab))
+            label = question_columns[question]
+            for i, answer in enumerate(vocab.values):
+                data[f"{label} - {answer}"] = grid.counts[:, i]
+        return pd.DataFrame(data)
+
+    tables = []
+    if include_total:
+        tables.append(to_table([TOTAL_LABEL], np.array([n_total]), lambda q: totals[q]))
+    for group in group_columns:
+        vocab = category_vocab[group]
+        n = np.pad(responses[group], (0, len(vocab) - len(responses[group])))
+        tables.append(to_table(vocab.values, n, lambda q, g=group: grids[(g, q)]))
+    return tables
@@ -1,13 +1,20 @@
 """
 Statistische Analysefunktionen für das Rewe-Projekt.
 
-Dieses Modul enthält Funktionen für Power-Analyse und statistische Tests.
+Dieses Modul enthält Funktionen für Power-Analyse, statistische Tests und die
+Anpassung von Verteilungen an klassierte Zeitangaben.
 """
 
 from __future__ import annotations
 
+import re
+import warnings
+
 import numpy as np
-from scipy import stats
+import pandas as pd
+from scipy import optimize, special, stats
+
+from rewe.data import GroupSizes
 
 
 def calculate_power(
@@ -39,7 +46,7 @@ def calculate_power(
 
 
 def power_analysis(
-    group_sizes: dict,
+    group_sizes: GroupSizes | dict,
     effect_size: float = 0.5,
     alpha: float = 0.05
 ) -> dict:
@@ -47,7 +54,7 @@ def power_analysis(
     Führt Power-Analyse für mehrere Gruppen durch.
     
     Args:
-        group_sizes: Dictionary mit Gruppennamen und Größen
+        group_sizes: ``GroupSizes`` oder Dictionary mit Gruppennamen und Größen
         effect_size: Cohen's d (Standard: 0.5 = mittlerer Effekt)
         alpha: Signifikanzniveau (Standard: 0.05)
         
@@ -59,35 +66,37 @@ def power_analysis(
         - 'max_power': Maximale Power
         - 'ratings': Dict mit Bewertungen ('sehr_gut', 'akzeptabel', 'unzureichend')
     """
-    powers = {}
-    ratings = {}
-    
-    for group, size in group_sizes.items():
-        if size is not None:
-            power = calculate_power(size, effect_size, alpha)
-            powers[group] = power
-            
-            # Bewertung
-            if power >= 0.80:
-                ratings[group] = 'sehr_gut'
-            elif power >= 0.60:
-                ratings[group] = 'akzeptabel'
-            else:
-                ratings[group] = 'unzureichend'
-    
-    power_values = list(powers.values())
+    groups = GroupSizes.coerce(group_sizes)
+    valid = np.flatnonzero(~groups.missing)
+    names = [groups.names[i] for i in valid]
+
+    # Power für alle Gruppen in einem Schritt berechnen
+    power_values = calculate_power(groups.sizes[valid], effect_size, alpha)
+    return _summarize_powers(names, power_values)
+
+
+def _summarize_powers(names: list, power_values: np.ndarray) -> dict:
+    """Bewertet Power-Werte und fasst sie im Format von ``power_analysis`` zusammen."""
+    rating_values = np.select(
+        [power_values >= 0.80, power_values >= 0.60],
+        ['sehr_gut', 'akzeptabel'],
+        default='unzureichend'
+    )
+
+    powers = dict(zip(names, power_values))
+    ratings = {name: str(rating) for name, rating in zip(names, rating_values)}
     
     return {
         'powers': powers,
-        'avg_power': np.mean(power_values) if power_values else 0,
-        'min_power': min(power_values) if power_values else 0,
-        'max_power': max(power_values) if power_values else 0,
+        'avg_power': power_values.mean() if len(names) else 0,
+        'min_power': power_values.min() if len(names) else 0,
+        'max_power': power_values.max() if len(names) else 0,
         'ratings': ratings
     }
 
 
 def print_group_analysis(
-    group_sizes: dict,
+    group_sizes: GroupSizes | dict,
     threshold: int = 30,
     show_percentages: bool = True
 ) -> None:
@@ -95,22 +104,19 @@ def print_group_analysis(
     Gibt eine formatierte Gruppenanalyse aus.
     
     Args:
-        group_sizes: Dictionary mit Gruppennamen und Größen
+        group_sizes: ``GroupSizes`` oder Dictionary mit Gruppennamen und Größen
         threshold: Schwellenwert für kleine Gruppen
         show_percentages: Ob Prozentanteile angezeigt werden sollen
     """
+    groups = GroupSizes.coerce(group_sizes)
+
     print("=" * 80)
     print("GRUPPENGRÖSSENANALYSE")
     print("=" * 80)
     
-    # Nach Größe sortieren
-    sorted_groups = sorted(
-        [(g, s) for g, s in group_sizes.items() if s is not None],
-        key=lambda x: x[1],
-        reverse=True
-    )
-    
-    total = sum(s for _, s in sorted_groups)
+    # Sortierreihenfolge ist in GroupSizes bereits vorberechnet
+    sorted_groups = groups.sorted_items()
+    total = groups.total
     
     print(f"\nGruppengröße (Anzahl Antworten):")
     print("-" * 80)
@@ -119,17 +125,17 @@ def print_group_analysis(
         marker = "✓" if size >= threshold else "⚠"
         if show_percentages and total > 0:
             percent = (size / total) * 100
-            print(f"{marker} {group:60s}: n = {size:4d} ({percent:5.1f}%)")
+            print(f"{marker} {group:60s}: n = {size:4} ({percent:5.1f}%)")
         else:
-            print(f"{marker} {group:60s}: n = {size:4d}")
+            print(f"{marker} {group:60s}: n = {size:4}")
     
-    print(f"\n{'Gesamt:':62s}  n = {total:4d}")
+    print(f"\n{'Gesamt:':62s}  n = {total:4}")
     
     # Kleine Gruppen identifizieren
-    small_groups = [s for _, s in sorted_groups if s < threshold]
+    small_count = int(groups.small_mask(threshold).sum())
     
-    print(f"\n{'Gruppen mit n < ' + str(threshold) + ':':62s}  {len(small_groups)}")
-    print(f"{'Gruppen mit n ≥ ' + str(threshold) + ':':62s}  {len(sorted_groups) - len(small_groups)}")
+    print(f"\n{'Gruppen mit n < ' + str(threshold) + ':':62s}  {small_count}")
+    print(f"{'Gruppen mit n ≥ ' + str(threshold) + ':':62s}  {len(sorted_groups) - small_count}")
     print("=" * 80)
 
 
@@ -174,3 +180,317 @@ def print_power_analysis(power_results: dict) -> None:
     print(f"Minimale Power:          {power_results['min_power']:.1%}")
     print(f"Maximale Power:          {power_results['max_power']:.1%}")
     print("=" * 80)
+
+
+DISTRIBUTIONS = ("lognormal", "gamma", "normal")
+
+
+ZERO_CLASS_UPPER = 1.0
+
+
+def time_bin_edges(labels: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Leitet Klassengrenzen in Minuten aus Antworttexten ab.
+
+    Erkennt die Texte der Arbeitsmappe wie ``"0 Minuten"``,
+    ``"ca. 1-10 Minuten"``, ``"ca 121-180 Minuten (2-3 Stunden)"``,
+    ``"bis 10 Minuten"`` und ``">7 Stunden"``. Offene Klassen erhalten die
+    Obergrenze ``inf``. Die Nullklasse (``"0 Minuten"``) wird als schmales
+    Intervall ``(0, ZERO_CLASS_UPPER]`` behandelt, damit stetige Verteilungen
+    ihr eine positive Wahrscheinlichkeit geben können. Ganzzahlig beschriftete
+    Klassen werden lückenlos aneinandergefügt (``11-30`` nach ``1-10`` wird zu
+    ``(10, 30]``), die unterste Klasse beginnt bei 0 (``1-10`` wird zu
+    ``(0, 10]``). Nicht erkannte Texte erhalten ``nan``.
+
+    Args:
+        labels: Antworttexte, optional mit Fragepräfix wie ``"Fr. 3 - "``
+
+    Returns:
+        Tupel aus (Untergrenzen, Obergrenzen) in Minuten
+    """
+    lower = np.full(len(labels), np.nan)
+    upper = np.full(len(labels), np.nan)
+
+    for i, label in enumerate(labels):
+        text = re.sub(r"^Fr\.\s*\d+\s*-\s*", "", str(label)).lower()
+        numbers = [float(x.replace(",", ".")) for x in re.findall(r"\d+(?:[.,]\d+)?", text)]
+        if not numbers:
+            continue
+        factor = 60 if "stunde" in text and "minute" not in text else 1
+
+        if re.search(r">|über|mehr als", text):
+            lower[i], upper[i] = numbers[0] * factor, np.inf
+        elif re.search(r"<|bis|unter|weniger als", text) and len(numbers) == 1:
+            lower[i], upper[i] = 0, numbers[0] * factor
+        elif len(numbers) >= 2:
+            lower[i], upper[i] = numbers[0] * factor, numbers[1] * factor
+        elif numbers == [0]:
+            lower[i], upper[i] = 0, ZERO_CLASS_UPPER
+
+    # Ganzzahlige Beschriftungen (z.B. 11-30 nach 1-10) lückenlos schließen,
+    # beginnend bei 0 für die unterste Klasse
+    previous_upper = 0.0
+    for cur in np.argsort(lower):
+        if np.isnan(lower[cur]):
+            break
+        if 0 < lower[cur] - previous_upper <= 1:
+            lower[cur] = previous_upper
+        previous_upper = upper[cur]
+
+    return lower, upper
+
+
+def _interval_cdf(
+    distribution: str, x: np.ndarray, params: np.ndarray, upper_tail: bool = False,
+) -> np.ndarray:
+    """
+    CDF für alle Gruppen (Zeilen von ``params``) an allen Grenzen ``x``.
+
+    Mit ``upper_tail=True`` wird die Überlebensfunktion ``1 - CDF`` direkt
+    berechnet, damit kleine Randwahrscheinlichkeiten nicht durch Auslöschung
+    verloren gehen.
+    """
+    sign = -1 if upper_tail else 1
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a, b = params[:, :1], np.exp(params[:, 1:])
+        if distribution == "normal":
+            return special.ndtr(sign * (x - a) / b)
+        if distribution == "lognormal":
+            return special.ndtr(sign * (np.log(x) - a) / b)
+        if distribution == "gamma":
+            gammainc = special.gammaincc if upper_tail else special.gammainc
+            return gammainc(np.exp(a), np.maximum(x, 0) / b)
+    raise ValueError(f"Unbekannte Verteilung: {distribution}. Erlaubt: {DISTRIBUTIONS}")
+
+
+def _interval_nll(distribution, params, counts, lower, upper) -> np.ndarray:
+    """Negative Log-Likelihood je Gruppe für intervallzensierte Häufigkeiten."""
+    cdf_lower = _interval_cdf(distribution, lower, params)
+    probs = np.where(
+        cdf_lower > 0.5,
+        _interval_cdf(distribution, lower, params, upper_tail=True)
+        - _interval_cdf(distribution, upper, params, upper_tail=True),
+        _interval_cdf(distribution, upper, params) - cdf_lower,
+    )
+    return -(counts * np.log(np.clip(probs, 1e-300, None))).sum(axis=1)
+
+
+def _initial_params(distribution, counts, lower, upper) -> np.ndarray:
+    """Startwerte aus gewichteten Klassenmitten (wie bisher im Notebook)."""
+    mid = np.where(np.isfinite(upper), (lower + upper) / 2, lower * 1.5)
+    mid = np.maximum(mid, 1e-3)
+    weights = counts / counts.sum(axis=1, keepdims=True)
+
+    if distribution == "lognormal":
+        mid = np.log(mid)
+    mean = weights @ mid
+    std = np.sqrt(np.maximum(weights @ mid**2 - mean**2, 1e-6))
+
+    if distribution == "gamma":
+        return np.column_stack([np.log(mean**2 / std**2), np.log(std**2 / mean)])
+    return np.column_stack([mean, np.log(std)])
+
+
+def fit_interval_censored(
+    counts,
+    lower,
+    upper,
+    *,
+    groups: list | None = None,
+    distributions: tuple[str, ...] = DISTRIBUTIONS,
+    quantiles: tuple[float, ...] = (0.25, 0.5, 0.75),
+) -> pd.DataFrame:
+    """
+    Passt Verteilungen per Maximum Likelihood an klassierte Häufigkeiten an.
+
+    Jede Klasse wird als Intervall ``(lower, upper]`` behandelt, statt ihre
+    Klassenmitte einzusetzen. Die Likelihood aller Gruppen wird vektorisiert
+    über die CDF-Differenzen an den Klassengrenzen berechnet und je Verteilung
+    in einem einzigen Optimiererlauf für alle Gruppen maximiert. Bei der
+    Normalverteilung wird die unterste Klasse nach unten geöffnet.
+
+    Gruppen, deren Antworten in weniger als zwei Klassen liegen, sind nicht
+    identifizierbar (Streuung → 0 bzw. nur eine offene Klasse). Sie werden
+    nicht angepasst, als ``degenerate`` markiert und erhalten ``nan``.
+
+    Args:
+        counts: Häufigkeiten mit Form ``(Gruppen, Klassen)``
+        lower: Untergrenzen der Klassen
+        upper: Obergrenzen der Klassen (``inf`` für offene Klassen)
+        groups: Optionale Gruppennamen (Standard: 0, 1, ...)
+        distributions: Anzupassende Verteilungen aus ``DISTRIBUTIONS``
+        quantiles: Zu berichtende Quantile der angepassten Verteilungen
+
+    Returns:
+        DataFrame mit einer Zeile je Gruppe und Verteilung: ``param_1`` und
+        ``param_2`` (normal: μ, σ; lognormal: μ, σ der logarithmierten Werte;
+        gamma: Form, Skala), ``log_likelihood``, ``aic``, ``mean``, je eine
+        Spalte ``q<Quantil>``, ``converged`` (Optimierer erfolgreich),
+        ``degenerate`` (weniger als zwei besetzte Klassen) sowie ``best``
+        (kleinstes AIC der Gruppe). Die Zeilen folgen der Reihenfolge der
+        Gruppen, innerhalb einer Gruppe aufsteigend nach AIC.
+
+    Raises:
+        ValueError: Bei unpassenden Formen oder ungültigen Klassengrenzen
+
+    Warns:
+        UserWarning: Für Gruppen mit Antworten in nur einer Klasse sowie wenn
+            der Optimierer für eine Verteilung nicht konvergiert
+    """
+    counts = np.atleast_2d(np.asarray(counts, dtype=float))
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    if lower.shape != (counts.shape[1],) or upper.shape != lower.shape:
+        raise ValueError("lower und upper müssen je Klasse eine Grenze enthalten")
+    if np.isnan(lower).any() or np.isnan(upper).any() or (upper <= lower).any():
+        raise ValueError("Klassengrenzen müssen definiert sein und lower < upper erfüllen")
+    if groups is None:
+        groups = list(range(counts.shape[0]))
+
+    # Auf die größte endliche Grenze skalieren, damit alle Parameter O(1) sind
+    scale = np.nanmax(np.where(np.isfinite(upper), upper, lower))
+    lower_s, upper_s = lower / scale, upper / scale
+
+    occupied = (counts > 0).sum(axis=1)
+    degenerate = occupied < 2
+    single = [g for g, n in zip(groups, occupied) if n == 1]
+    if single:
+        warnings.warn(
+            f"Keine Anpassung für Gruppen mit Antworten in nur einer Klasse: {single}",
+            stacklevel=2,
+        )
+
+    fitted = np.flatnonzero(~degenerate)
+    observed = counts[fitted]
+    step = 1e-6
+    rows = []
+
+    for distribution in distributions:
+        lo = lower_s.copy()
+        if distribution == "normal":
+            lo[np.argmin(lo)] = -np.inf
+
+        def objective(flat):
+            params = flat.reshape(-1, 2)
+            value = _interval_nll(distribution, params, observed, lo, upper_s)
+            # Parameter der Gruppen sind unabhängig: 4 Auswertungen für den Gradienten
+            grad = np.empty_like(params)
+            for j in range(2):
+                shift = np.zeros_like(params)
+                shift[:, j] = step
+                grad[:, j] = (
+                    _interval_nll(distribution, params + shift, observed, lo, upper_s)
+                    - _interval_nll(distribution, params - shift, observed, lo, upper_s)
+                ) / (2 * step)
+            return value.sum(), grad.ravel()
+
+        params = np.full((counts.shape[0], 2), np.nan)
+        nll = np.full(counts.shape[0], np.nan)
+        converged = np.zeros(counts.shape[0], dtype=bool)
+        if len(fitted):
+            start = _initial_params(distribution, observed, lower_s, upper_s)
+            result = optimize.minimize(objective, start.ravel(), jac=True, method="L-BFGS-B")
+            if not result.success:
+                warnings.warn(
+                    f"Anpassung der Verteilung '{distribution}' nicht konvergiert: "
+                    f"{result.message}",
+                    stacklevel=2,
+                )
+            params[fitted] = result.x.reshape(-1, 2)
+            nll[fitted] = _interval_nll(distribution, params[fitted], observed, lo, upper_s)
+            converged[fitted] = result.success
+
+        # Zurück auf Minuten transformieren
+        a, b = params[:, 0], np.exp(params[:, 1])
+        z = stats.norm.ppf(quantiles)
+        if distribution == "normal":
+            p1, p2 = a * scale, b * scale
+            mean = p1
+            qs = p1[:, None] + p2[:, None] * z
+        elif distribution == "lognormal":
+            p1, p2 = a + np.log(scale), b
+            mean = np.exp(p1 + p2**2 / 2)
+            qs = np.exp(p1[:, None] + p2[:, None] * z)
+        else:
+            p1, p2 = np.exp(a), b * scale
+            mean = p1 * p2
+            qs = special.gammaincinv(p1[:, None], np.asarray(quantiles)) * p2[:, None]
+
+        frame = pd.DataFrame({
+            'group': groups,
+            'distribution': distribution,
+            'param_1': p1,
+            'param_2': p2,
+            'log_likelihood': -nll,
+            'aic': 2 * 2 + 2 * nll,
+            'mean': mean,
+            'converged': converged,
+            'degenerate': degenerate,
+        })
+        for q, column in zip(quantiles, qs.T):
+            frame[f'q{q:g}'] = column
+        rows.append(frame)
+
+    result = pd.concat(rows, ignore_index=True)
+    position = np.tile(np.arange(counts.shape[0]), len(distributions))
+    result['best'] = result['aic'] == result.groupby(position, sort=False)['aic'].transform('min')
+    # Reihenfolge der Gruppen beibehalten, innerhalb der Gruppe nach AIC
+    order = np.lexsort((result['aic'].to_numpy(), position))
+    return result.iloc[order].reset_index(drop=True)
+
+
+def fit_time_distributions(
+    table: pd.DataFrame,
+    question: str,
+    *,
+    distributions: tuple[str, ...] = DISTRIBUTIONS,
+    quantiles: tuple[float, ...] = (0.25, 0.5, 0.75),
+) -> pd.DataFrame:
+    """
+    Passt Zeitverteilungen für eine Frage mit Zeitklassen (z.B. Fr. 3, Fr. 5) an.
+
+    Args:
+        table: Tabelle im Format von ``load_hitlisten_tables`` (Kategorien als
+            Zeilen, ``"<Frage> - <Antwort>"``-Spalten)
+        question: Fragennummer, z.B. ``"Fr. 3"`` (Leerzeichen werden ignoriert)
+        distributions: Anzupassende Verteilungen aus ``DISTRIBUTIONS``
+        quantiles: Zu berichtende Quantile
+
+    Returns:
+        Ergebnis von ``fit_interval_censored`` mit Kategorien als ``group``
+
+    Raises:
+        ValueError: Wenn keine Spalten mit erkennbaren Zeitklassen gefunden werden
+
+    Warns:
+        UserWarning: Wenn Spalten mit Antworten ausgelassen werden, weil ihre
+            Klassengrenzen nicht erkannt wurden
+    """
+    key = re.sub(r"\s+", "", question)
+    columns = [
+        column for column in table.columns[2:]
+        if re.sub(r"\s+", "", str(column)).startswith(key + "-")
+    ]
+    lower, upper = time_bin_edges(columns)
+    known = ~np.isnan(lower)
+    if not known.any():
+        raise ValueError(f"Keine Zeitklassen für {question} gefunden")
+
+    all_counts = table[columns].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy()
+    answered = all_counts.sum(axis=0) > 0
+    dropped = [c for c, ok, used in zip(columns, known, answered) if used and not ok]
+    if dropped:
+        warnings.warn(
+            f"{question}: Spalten mit unbekannten Zeitklassen werden ausgelassen: {dropped}",
+            stacklevel=2,
+        )
+
+    counts = all_counts[:, known]
+    return fit_interval_censored(
+        counts,
+        lower[known],
+        upper[known],
+        groups=table.iloc[:, 0].astype(str).tolist(),
+        distributions=distributions,
+        quantiles=quantiles,
+    )
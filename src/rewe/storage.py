@@ -0,0 +1,184 @@
+"""
+Speicherfunktionen für verarbeitete Daten des Rewe-Projekts.
+
+Dieses Modul schreibt die Hitlisten-Daten im Long-Format als partitioniertes
+Parquet-Dataset nach ``data/processed`` und liest sie mit Spaltenprojektion
+und Filtern wieder ein. Benötigt das optionale Paket ``pyarrow``.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from rewe.data import table_to_long_format
+from rewe.utils import get_data_path
+
+DATASET_NAME = "hitlisten"
+
+
+def _require_pyarrow():
+    """Importiert ``pyarrow`` oder gibt einen verständlichen Fehler aus."""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as exc:
+        raise ImportError(
+            "Für das Parquet-Dataset wird 'pyarrow' benötigt: pip install rewe[parquet]"
+        ) from exc
+    return pa, ds
+
+
+def _partitioning(pa, ds):
+    """Hive-Partitionierung nach Snapshot, Tabelle und Fragennummer."""
+    schema = pa.schema([
+        ("snapshot", pa.string()),
+        ("table", pa.int32()),
+        ("question", pa.int32()),
+    ])
+    return ds.partitioning(schema, flavor="hive")
+
+
+def _default_root() -> Path:
+    return get_data_path("processed") / DATASET_NAME
+
+
+def hitlisten_to_long_format(tables: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Fasst alle Hitlisten-Tabellen in einem Long-Format-DataFrame zusammen.
+
+    Args:
+        tables: Tabellen aus ``load_hitlisten_tables``
+
+    Returns:
+        DataFrame mit den Spalten aus ``table_to_long_format`` sowie ``table``
+        (Tabellenindex) und ``question`` (Fragennummer als Ganzzahl, 0 falls
+        keine Fragennummer erkannt wurde)
+
+    Raises:
+        ValueError: Wenn ``tables`` leer ist
+    """
+    if not tables:
+        raise ValueError("Keine Tabellen zum Umwandeln übergeben")
+
+    frames = []
+    for index, table in enumerate(tables):
+        long, _ = table_to_long_format(table)
+        long['table'] = index
+        frames.append(long)
+
+    long = pd.concat(frames, ignore_index=True)
+    long['question'] = (
+        long['Question_Number']
+        .str.extract(r'(\d+)', expand=False)
+        .fillna(0)
+        .astype("int32")
+    )
+    long['table'] = long['table'].astype("int32")
+    return long
+
+
+def write_processed_dataset(
+    tables: Sequence[pd.DataFrame],
+    snapshot: str,
+    *,
+    root: Path | None = None,
+) -> Path:
+    """
+    Schreibt Hitlisten-Tabellen als partitioniertes Parquet-Dataset.
+
+    Das Dataset ist nach ``snapshot``, ``table`` und ``question`` partitioniert
+    (Hive-Layout, z.B. ``snapshot=251105/table=2/question=5``). Ein erneuter
+    Export desselben Snapshots ersetzt alle vorhandenen Partitionen dieses
+    Snapshots, auch solche, die im neuen Export nicht mehr vorkommen.
+
+    Args:
+        tables: Tabellen aus ``load_hitlisten_tables``
+        snapshot: Bezeichnung des Datenstands, z.B. das Exportdatum ``"251105"``
+        root: Zielverzeichnis. Standard ist ``data/processed/hitlisten``
+
+    Returns:
+        Pfad zum Wurzelverzeichnis des Datasets
+
+    Raises:
+        ValueError: Wenn ``snapshot`` leer ist oder ungültige Zeichen enthält
+            oder ``tables`` leer ist
+    """
+    pa, ds = _require_pyarrow()
+
+    if not snapshot or not re.fullmatch(r"[\w.\-]+", snapshot):
+        raise ValueError("snapshot darf nur Buchstaben, Ziffern, '.', '_' und '-' enthalten")
+
+    long = hitlisten_to_long_format(tables)
+    long['snapshot'] = snapshot
+
+    root = _default_root() if root is None else Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    # Alten Stand des Snapshots vollständig entfernen, damit keine veralteten
+    # Partitionen (z.B. entfallene Fragen) zurückbleiben
+    snapshot_dir = root / f"snapshot={snapshot}"
+    if snapshot_dir.exists():
+        shutil.rmtree(snapshot_dir)
+
+    ds.write_dataset(
+        pa.Table.from_pandas(long, preserve_index=False),
+        root,
+        format="parquet",
+        partitioning=_partitioning(pa, ds),
+        basename_template=f"part-{snapshot}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return root
+
+
+def read_processed_dataset(
+    *,
+    columns: Sequence[str] | None = None,
+    filters: list | None = None,
+    root: Path | None = None,
+) -> pd.DataFrame:
+    """
+    Liest das partitionierte Parquet-Dataset mit Projektion und Filtern.
+
+    Filter auf Partitionsspalten (``snapshot``, ``table``, ``question``)
+    überspringen ganze Verzeichnisse, übrige Filter werden beim Scannen der
+    Dateien angewendet. Dateien werden per Memory-Mapping gelesen.
+
+    Args:
+        columns: Zu ladende Spalten. Standard sind alle Spalten
+        filters: Filter im Format von ``pandas.read_parquet``, z.B.
+            ``[("question", "=", 5), ("Category", "=", "IT & Daten")]``
+        root: Wurzelverzeichnis des Datasets. Standard ist
+            ``data/processed/hitlisten``
+
+    Returns:
+        DataFrame mit den ausgewählten Zeilen und Spalten
+
+    Raises:
+        FileNotFoundError: Wenn das Dataset nicht existiert
+    """
+    pa, ds = _require_pyarrow()
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+
+    root = _default_root() if root is None else Path(root)
+    if not root.exists():
+        raise FileNotFoundError(f"Parquet-Dataset nicht gefunden: {root}")
+
+    dataset = ds.dataset(
+        str(root.resolve()),
+        format="parquet",
+        partitioning=_partitioning(pa, ds),
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=expression,
+    )
+    return table.to_pandas()
@@ -0,0 +1,220 @@
+"""
+Konsistenzprüfung für Hitlisten-Tabellen im Rewe-Projekt.
+
+Dieses Modul prüft geladene Tabellen auf interne Widersprüche, bevor
+Statistiken oder Visualisierungen erstellt werden. Alle Regeln werden als
+Array-Operationen über sämtliche Tabellen, Kategorien und Fragen zugleich
+ausgewertet.
+"""
+
+from __future__ import annotations
+
+import re
+import warnings
+from typing import Collection, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SINGLE_CHOICE = ("Fr. 3", "Fr. 5")
+
+REPORT_COLUMNS = ["table", "category", "question", "column", "rule", "value", "limit"]
+
+VALIDATION_MODES = (None, "warn", "strict")
+
+
+def _summarize(report: pd.DataFrame) -> str:
+    """Kurzbeschreibung eines Verstoßberichts für Fehler- und Warnmeldungen."""
+    counts = report["rule"].value_counts()
+    summary = ", ".join(f"{rule}: {count}" for rule, count in counts.items())
+    message = f"{len(report)} Konsistenzverstöße in Hitlisten-Tabellen ({summary})"
+    if "sheet" in report:
+        message += f" in Arbeitsblättern {list(dict.fromkeys(report['sheet']))}"
+    return message
+
+
+class HitlistenValidationError(ValueError):
+    """Wird im Strict-Modus ausgelöst; ``report`` enthält alle Verstöße."""
+
+    def __init__(self, report: pd.DataFrame) -> None:
+        self.report = report
+        super().__init__(_summarize(report))
+
+
+class HitlistenValidationWarning(UserWarning):
+    """Wird im Warn-Modus ausgegeben; ``report`` enthält alle Verstöße."""
+
+    def __init__(self, report: pd.DataFrame) -> None:
+        self.report = report
+        super().__init__(_summarize(report))
+
+
+def _question_key(text: str) -> str | None:
+    """Normalisiert Fragennummern (``"Fr.3"`` und ``"Fr. 3"`` → ``"Fr. 3"``)."""
+    match = re.match(r"Fr\.\s*(\d+)", str(text))
+    return f"Fr. {match.group(1)}" if match else None
+
+
+def validate_hitlisten_tables(
+    tables: Sequence[pd.DataFrame],
+    *,
+    single_choice: Collection[str] = DEFAULT_SINGLE_CHOICE,
+    tolerance: float = 1e-9,
+) -> pd.DataFrame:
+    """
+    Prüft Hitlisten-Tabellen auf interne Konsistenz.
+
+    Geprüfte Regeln:
+    - ``invalid_n``: Anzahl Antworten fehlt oder ist ≤ 0, obwohl Werte vorliegen
+    - ``negative_count``: Häufigkeit ist negativ
+    - ``non_integer_count``: Häufigkeit ist keine ganze Zahl
+    - ``count_exceeds_n``: Häufigkeit einer Antwort übersteigt n der Kategorie
+    - ``single_choice_sum_exceeds_n``: Summe der Antworten einer
+      Einfachauswahl-Frage übersteigt n (relative Werte summieren sich auf > 1)
+
+    Args:
+        tables: Tabellen im Format von ``load_hitlisten_tables``
+        single_choice: Fragennummern mit Einfachauswahl (Standard: Fr. 3, Fr. 5)
+        tolerance: Zulässige numerische Abweichung
+
+    Returns:
+        DataFrame mit einer Zeile pro Verstoß und den Spalten ``table``,
+        ``category``, ``question``, ``column``, ``rule``, ``value`` und
+        ``limit``. Leer, wenn alle Tabellen konsistent sind.
+    """
+    if not tables:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    # Alle Tabellen zu einem Array stapeln (gleiche Schemas → gleiche Spalten)
+    frames = []
+    for index, table in enumerate(tables):
+        frame = table.iloc[:, 1:].apply(pd.to_numeric, errors="coerce")
+        frame.columns = ["__n__", *map(str, table.columns[2:])]
+        frame.insert(0, "__category__", table.iloc[:, 0].astype(str).to_numpy())
+        frame.insert(0, "__table__", index)
+        frames.append(frame)
+    stacked = pd.concat(frames, ignore_index=True)
+
+    table_ids = stacked["__table__"].to_numpy()
+    categories = stacked["__category__"].to_numpy()
+    n = stacked["__n__"].to_numpy(dtype=float)
+    columns = np.asarray(stacked.columns[3:], dtype=object)
+    values = stacked.iloc[:, 3:].to_numpy(dtype=float)
+    questions = np.array([_question_key(c) for c in columns], dtype=object)
+
+    observed = ~np.isnan(values)
+    n_column = n[:, None]
+    reports = []
+
+    def collect(rule, rows, cols, found, limit):
+        reports.append(pd.DataFrame({
+            "table": table_ids[rows],
+            "category": categories[rows],
+            "question": questions[cols] if cols is not None else None,
+            "column": columns[cols] if cols is not None else None,
+            "rule": rule,
+            "value": found,
+            "limit": limit,
+        }))
+
+    # Zeilenregel: fehlendes oder nicht positives n bei vorhandenen Werten
+    rows = np.flatnonzero(~(n > 0) & observed.any(axis=1))
+    collect("invalid_n", rows, None, n[rows], 0.0)
+
+    # Zellregeln
+    cell_rules = [
+        ("negative_count", observed & (values < -tolerance), np.zeros_like(values)),
+        ("non_integer_count",
+         observed & (np.abs(values - np.round(values)) > tolerance),
+         np.round(values)),
+        ("count_exceeds_n",
+         observed & (n_column > 0) & (values > n_column + tolerance),
+         np.broadcast_to(n_column, values.shape)),
+    ]
+    for rule, mask, limits in cell_rules:
+        rows, cols = np.nonzero(mask)
+        collect(rule, rows, cols, values[rows, cols], limits[rows, cols])
+
+    # Einfachauswahl: Summe je (Zeile, Frage) über eine Zuordnungsmatrix
+    keys = sorted({_question_key(q) for q in single_choice} & set(questions) - {None})
+    if keys:
+        membership = (questions[:, None] == np.array(keys, dtype=object)[None, :]).astype(float)
+        sums = np.nan_to_num(values) @ membership
+        answered = observed.astype(float) @ membership > 0
+        mask = answered & (n_column > 0) & (sums > n_column + tolerance)
+        rows, question_idx = np.nonzero(mask)
+        report = pd.DataFrame({
+            "table": table_ids[rows],
+            "category": categories[rows],
+            "question": np.array(keys, dtype=object)[question_idx],
+            "column": None,
+            "rule": "single_choice_sum_exceeds_n",
+            "value": sums[rows, question_idx],
+            "limit": n[rows],
+        })
+        reports.append(report)
+
+    reports = [r for r in reports if len(r)]
+    if not reports:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    return pd.concat(reports, ignore_index=True)[REPORT_COLUMNS]
+
+
+def check_hitlisten_tables(
+    tables: Sequence[pd.DataFrame],
+    mode: str | None,
+    **kwargs,
+) -> pd.DataFrame | None:
+    """
+    Führt ``validate_hitlisten_tables`` im gewählten Modus aus.
+
+    Args:
+        tables: Zu prüfende Tabellen
+        mode: ``None`` (keine Prüfung), ``"warn"`` (Warnung bei Verstößen)
+            oder ``"strict"`` (Abbruch bei Verstößen)
+        **kwargs: Weitere Argumente für ``validate_hitlisten_tables``
+
+    Returns:
+        Verstoßbericht oder ``None``, falls nicht geprüft wurde
+
+    Raises:
+        ValueError: Bei unbekanntem Modus
+        HitlistenValidationError: Im Strict-Modus, wenn Verstöße gefunden werden
+
+    Warns:
+        HitlistenValidationWarning: Im Warn-Modus, wenn Verstöße gefunden werden
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"validation muss einer von {VALIDATION_MODES} sein")
+    if mode is None:
+        return None
+
+    report = validate_hitlisten_tables(tables, **kwargs)
+    report_violations(report, mode, stacklevel=3)
+    return report
+
+
+def report_violations(report: pd.DataFrame, mode: str | None, *, stacklevel: int = 2) -> None:
+    """
+    Warnt bzw. bricht ab, wenn ``report`` Verstöße enthält.
+
+    Der Bericht ist in beiden Fällen über das Attribut ``report`` der
+    Warnung bzw. des Fehlers erreichbar.
+
+    Args:
+        report: Verstoßbericht aus ``validate_hitlisten_tables``, optional mit
+            zusätzlicher Spalte ``sheet``
+        mode: ``None``, ``"warn"`` oder ``"strict"``
+        stacklevel: Wie bei ``warnings.warn``, bezogen auf den Aufrufer
+
+    Raises:
+        HitlistenValidationError: Im Strict-Modus, wenn Verstöße vorliegen
+
+    Warns:
+        HitlistenValidationWarning: Im Warn-Modus, wenn Verstöße vorliegen
+    """
+    if mode is None or not len(report):
+        return
+    if mode == "strict":
+        raise HitlistenValidationError(report)
+    warnings.warn(HitlistenValidationWarning(report), stacklevel=stacklevel + 1)
@@ -4,9 +4,20 @@ Visualisierungsfunktionen für das Rewe-Projekt.
 Dieses Modul enthält Funktionen zur Erstellung standardisierter Visualisierungen.
 """
 
+from __future__ import annotations
+
+import re
+from typing import Sequence
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import Normalize
+from matplotlib.patches import Patch
+
+from rewe.data import GroupSizes
 
 
 def set_style(style: str = "whitegrid") -> None:
@@ -22,8 +33,8 @@ def set_style(style: str = "whitegrid") -> None:
 
 
 def plot_group_comparison(
-    original_groups: dict,
-    aggregated_groups: dict,
+    original_groups: GroupSizes | dict,
+    aggregated_groups: GroupSizes | dict,
     threshold: int = 30,
     figsize: tuple = (16, 7)
 ) -> plt.Figure:
@@ -31,8 +42,10 @@ def plot_group_comparison(
     Erstellt einen Vergleich zwischen Original- und aggregierten Gruppen.
     
     Args:
-        original_groups: Dictionary mit Original-Gruppennamen und Größen
-        aggregated_groups: Dictionary mit aggregierten Gruppennamen und Größen
+        original_groups: ``GroupSizes`` oder Dictionary mit Original-Gruppennamen
+            und Größen
+        aggregated_groups: ``GroupSizes`` oder Dictionary mit aggregierten
+            Gruppennamen und Größen
         threshold: Schwellenwert für farbliche Markierung (Standard: 30)
         figsize: Größe der Figur (Standard: (16, 7))
         
@@ -41,21 +54,18 @@ def plot_group_comparison(
     """
     fig, axes = plt.subplots(1, 2, figsize=figsize)
     
-    # Original-Gruppen vorbereiten
-    sorted_original = sorted(
-        [(g, s) for g, s in original_groups.items() if s is not None],
-        key=lambda x: x[1],
-        reverse=True
-    )
-    orig_names = [g for g, _ in sorted_original]
-    orig_sizes = [s for _, s in sorted_original]
-    colors_orig = ['red' if s < threshold else 'green' for s in orig_sizes]
+    original = GroupSizes.coerce(original_groups)
+    aggregated = GroupSizes.coerce(aggregated_groups)
+
+    # Original-Gruppen vorbereiten (Sortierung ist bereits vorberechnet)
+    orig_names = original.sorted_names
+    orig_sizes = original.sorted_sizes.tolist()
+    colors_orig = np.where(original.sorted_sizes < threshold, 'red', 'green').tolist()
     
     # Aggregierte Gruppen vorbereiten
-    sorted_agg = sorted(aggregated_groups.items(), key=lambda x: x[1], reverse=True)
-    agg_names = [g for g, _ in sorted_agg]
-    agg_sizes = [s for _, s in sorted_agg]
-    colors_agg = ['red' if s < threshold else 'green' for s in agg_sizes]
+    agg_names = aggregated.sorted_names
+    agg_sizes = aggregated.sorted_sizes.tolist()
+    colors_agg = np.where(aggregated.sorted_sizes < threshold, 'red', 'green').tolist()
     
     # Subplot 1: Original
     ax1 = axes[0]
@@ -65,7 +75,7 @@ def plot_group_comparison(
     ax1.set_yticklabels(orig_names, fontsize=9)
     ax1.set_xlabel('Anzahl Teilnehmer (n)', fontsize=11, fontweight='bold')
     
-    small_count = sum(1 for s in orig_sizes if s < threshold)
+    small_count = int(original.small_mask(threshold).sum())
     ax1.set_title(f'ORIGINAL\n{len(orig_names)} Gruppen ({small_count} mit n<{threshold})',
                   fontsize=12, fontweight='bold')
     ax1.axvline(x=threshold, color='orange', linestyle='--', linewidth=2,
@@ -86,7 +96,7 @@ def plot_group_comparison(
     ax2.set_yticklabels(agg_names, fontsize=9)
     ax2.set_xlabel('Anzahl Teilnehmer (n)', fontsize=11, fontweight='bold')
     
-    small_count_agg = sum(1 for s in agg_sizes if s < threshold)
+    small_count_agg = int(aggregated.small_mask(threshold).sum())
     ax2.set_title(f'AGGREGIERT\n{len(agg_names)} Gruppen ({small_count_agg} mit n<{threshold})',
                   fontsize=12, fontweight='bold')
     ax2.axvline(x=threshold, color='orange', linestyle='--', linewidth=2,
@@ -106,20 +116,28 @@ def plot_group_comparison(
     return fig
 
 
-def print_comparison_stats(original_groups: dict, aggregated_groups: dict, threshold: int = 30) -> None:
+def print_comparison_stats(
+    original_groups: GroupSizes | dict,
+    aggregated_groups: GroupSizes | dict,
+    threshold: int = 30
+) -> None:
     """
     Gibt eine formatierte Vergleichsstatistik aus.
     
     Args:
-        original_groups: Dictionary mit Original-Gruppennamen und Größen
-        aggregated_groups: Dictionary mit aggregierten Gruppennamen und Größen
+        original_groups: ``GroupSizes`` oder Dictionary mit Original-Gruppennamen
+            und Größen
+        aggregated_groups: ``GroupSizes`` oder Dictionary mit aggregierten
+            Gruppennamen und Größen
         threshold: Schwellenwert für Gruppengröße (Standard: 30)
     """
-    orig_sizes = [s for s in original_groups.values() if s is not None]
-    agg_sizes = list(aggregated_groups.values())
+    original = GroupSizes.coerce(original_groups)
+    aggregated = GroupSizes.coerce(aggregated_groups)
+    orig_sizes = original.valid_sizes
+    agg_sizes = aggregated.valid_sizes
     
-    small_orig = sum(1 for s in orig_sizes if s < threshold)
-    small_agg = sum(1 for s in agg_sizes if s < threshold)
+    small_orig = int(original.small_mask(threshold).sum())
+    small_agg = int(aggregated.small_mask(threshold).sum())
     
     print("\n" + "=" * 80)
     print("VERGLEICHSSTATISTIK: ORIGINAL vs. AGGREGIERT")
@@ -129,18 +147,169 @@ def print_comparison_stats(original_groups: dict, aggregated_groups: dict, thres
     print(f"  Anzahl Gruppen:              {len(orig_sizes)}")
     print(f"  Gruppen mit n < {threshold}:          {small_orig} ({small_orig/len(orig_sizes)*100:.0f}%)")
     print(f"  Gruppen mit n ≥ {threshold}:          {len(orig_sizes) - small_orig} ({(len(orig_sizes) - small_orig)/len(orig_sizes)*100:.0f}%)")
-    print(f"  Kleinste Gruppe:             n = {min(orig_sizes)}")
-    print(f"  Größte Gruppe:               n = {max(orig_sizes)}")
+    print(f"  Kleinste Gruppe:             n = {orig_sizes.min()}")
+    print(f"  Größte Gruppe:               n = {orig_sizes.max()}")
     
     print(f"\nAGGREGIERT:")
     print(f"  Anzahl Gruppen:              {len(agg_sizes)}")
     print(f"  Gruppen mit n < {threshold}:          {small_agg} ({small_agg/len(agg_sizes)*100:.0f}%)")
     print(f"  Gruppen mit n ≥ {threshold}:          {len(agg_sizes) - small_agg} ({(len(agg_sizes) - small_agg)/len(agg_sizes)*100:.0f}%)")
-    print(f"  Kleinste Gruppe:             n = {min(agg_sizes)}")
-    print(f"  Größte Gruppe:               n = {max(agg_sizes)}")
+    print(f"  Kleinste Gruppe:             n = {agg_sizes.min()}")
+    print(f"  Größte Gruppe:               n = {agg_sizes.max()}")
     
     improvement = small_orig - small_agg
     print(f"\n✓ VERBESSERUNG: {improvement} Gruppen wurden auf n≥{threshold} gebracht!")
     print(f"✓ REDUKTION: {len(orig_sizes) - len(agg_sizes)} Gruppen aggregiert")
     print("=" * 80)
 
+
+def _question_blocks(
+    table: pd.DataFrame,
+    questions: Sequence[str] | None,
+) -> list[tuple[str, np.ndarray, list[str]]]:
+    """Ordnet Spalten ihren Fragen zu: ``(Frage, Spaltenpositionen, Antworten)``."""
+    blocks: dict[int, tuple[str, list[int], list[str]]] = {}
+    for position, column in enumerate(table.columns[2:]):
+        match = re.match(r"Fr\.\s*(\d+)\s*-\s*(.*)", str(column), re.S)
+        if match is None:
+            continue
+        number = int(match.group(1))
+        _, positions, answers = blocks.setdefault(number, (f"Fr. {number}", [], []))
+        positions.append(position)
+        answers.append(" ".join(match.group(2).split()))
+
+    if questions is not None:
+        matches = [re.match(r"Fr\.\s*(\d+)", str(q)) for q in questions]
+        wanted = [int(m.group(1)) if m else None for m in matches]
+        missing = [q for q, number in zip(questions, wanted) if number not in blocks]
+        if missing:
+            raise ValueError(f"Fragen nicht in der Tabelle gefunden: {missing}")
+        numbers = wanted
+    else:
+        numbers = sorted(blocks)
+    return [
+        (blocks[n][0], np.asarray(blocks[n][1]), blocks[n][2]) for n in numbers
+    ]
+
+
+def plot_question_overview(
+    table: pd.DataFrame,
+    *,
+    questions: Sequence[str] | None = None,
+    kind: str = "heatmap",
+    relative: bool = True,
+    ncols: int = 4,
+    panel_size: tuple = (4, 3),
+    max_label_length: int = 25,
+    cmap: str = "viridis",
+) -> plt.Figure:
+    """
+    Stellt alle Fragen und Gruppen einer Tabelle als Small Multiples dar.
+
+    Pro Frage entsteht ein Panel mit allen Kategorien und Antwortoptionen.
+    Alle Werte stammen aus einem vorab berechneten Array, und jedes Panel
+    besteht aus einem einzigen Collection-Artist (``QuadMesh`` bzw.
+    ``PolyCollection``) statt aus einzelnen Balken und Textobjekten. Für
+    mehrere Gruppierungen können Tabellen vorher mit ``pd.concat``
+    zusammengefügt werden.
+
+    Args:
+        table: Tabelle im Format von ``load_hitlisten_tables`` (Kategorie,
+            Anzahl Antworten, ``"<Frage> - <Antwort>"``-Spalten)
+        questions: Optionale Auswahl von Fragen, z.B. ``["Fr. 3", "Fr. 5"]``.
+            Standard sind alle Fragen in aufsteigender Reihenfolge
+        kind: ``"heatmap"`` (Kategorien × Antworten) oder ``"bars"``
+            (gruppierte Balken je Antwort)
+        relative: Ob Anteile (Wert / Anzahl Antworten) statt absoluter
+            Häufigkeiten dargestellt werden (Standard: True)
+        ncols: Anzahl Panels pro Zeile (Standard: 4)
+        panel_size: Größe eines Panels in Zoll (Standard: (4, 3))
+        max_label_length: Maximale Länge der Antwortbeschriftungen
+        cmap: Farbskala für Heatmap bzw. Kategorienfarben
+
+    Returns:
+        matplotlib Figure-Objekt
+
+    Raises:
+        ValueError: Bei unbekanntem ``kind`` oder fehlenden Fragen
+    """
+    if kind not in ("heatmap", "bars"):
+        raise ValueError("kind muss 'heatmap' oder 'bars' sein")
+
+    blocks = _question_blocks(table, questions)
+    if not blocks:
+        raise ValueError("Keine Fragenspalten (\"Fr. <Nr> - <Antwort>\") gefunden")
+
+    # Ein gemeinsames Werte-Array für alle Panels
+    categories = table.iloc[:, 0].astype(str).tolist()
+    values = table.iloc[:, 2:].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    if relative:
+        n = pd.to_numeric(table.iloc[:, 1], errors="coerce").to_numpy(dtype=float)
+        # Zeilen ohne gültiges n (0, fehlend) haben keinen Anteil
+        values = np.divide(
+            values, n[:, None], out=np.full_like(values, np.nan), where=(n > 0)[:, None]
+        )
+    norm = Normalize(0, np.nanmax(values) if np.isfinite(values).any() else 1)
+    colormap = plt.get_cmap(cmap)
+
+    nrows = -(-len(blocks) // ncols)
+    fig, axes = plt.subplots(
+        nrows, ncols, squeeze=False, sharey=(kind == "heatmap"), layout="constrained",
+        figsize=(panel_size[0] * ncols, panel_size[1] * nrows),
+    )
+    n_categories = len(categories)
+    category_colors = colormap(np.linspace(0, 1, max(n_categories, 2)))[:n_categories]
+    bar_width = 0.8 / max(n_categories, 1)
+
+    for ax, (question, positions, answers) in zip(axes.flat, blocks):
+        block = values[:, positions]
+        n_answers = len(positions)
+
+        if kind == "heatmap":
+            artist = ax.pcolormesh(np.ma.masked_invalid(block), cmap=colormap, norm=norm)
+            ticks = np.arange(n_answers) + 0.5
+        else:
+            # Alle Balken eines Panels als Rechtecke einer PolyCollection
+            left = (np.arange(n_answers)[None, :] - 0.4
+                    + np.arange(n_categories)[:, None] * bar_width).ravel()
+            height = np.nan_to_num(block).ravel()
+            verts = np.stack([
+                np.column_stack([left, np.zeros_like(left)]),
+                np.column_stack([left, height]),
+                np.column_stack([left + bar_width, height]),
+                np.column_stack([left + bar_width, np.zeros_like(left)]),
+            ], axis=1)
+            ax.add_collection(PolyCollection(
+                verts, facecolors=np.repeat(category_colors, n_answers, axis=0),
+                edgecolors="none",
+            ))
+            ax.set_xlim(-0.5, n_answers - 0.5)
+            ax.set_ylim(0, norm.vmax * 1.05)
+            ax.grid(axis='y', alpha=0.3)
+            ticks = np.arange(n_answers)
+
+        labels = [
+            a if len(a) <= max_label_length else a[:max_label_length - 1] + "…"
+            for a in answers
+        ]
+        ax.set_xticks(ticks)
+        ax.set_xticklabels(labels, rotation=90, fontsize=7)
+        ax.set_title(question, fontsize=11, fontweight='bold')
+
+    for ax in axes.flat[len(blocks):]:
+        ax.set_visible(False)
+
+    if kind == "heatmap":
+        for ax in axes[:, 0]:
+            ax.set_yticks(np.arange(n_categories) + 0.5)
+            ax.set_yticklabels(categories, fontsize=8)
+        axes[0, 0].invert_yaxis()
+        fig.colorbar(artist, ax=axes, shrink=0.6,
+                     label='Anteil' if relative else 'Anzahl')
+    else:
+        fig.legend(
+            handles=[Patch(color=c, label=cat) for c, cat in zip(category_colors, categories)],
+            loc='outside upper center', ncol=min(n_categories, 8), fontsize=9,
+        )
+
+    return fig
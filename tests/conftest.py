@@ -0,0 +1,19 @@
+"""Gemeinsame Fixtures für die Tests des Rewe-Projekts."""
+
+import pandas as pd
+import pytest
+
+from rewe.data import CATEGORY_COLUMN, RESPONSES_COLUMN
+
+DEFAULT_ANSWERS = ("Fr.1 - Übersetzen", "Fr. 3 - ca 11-30 Minuten", "Fr. 3 - >7 Stunden")
+
+
+def _make_table(rows, answers=DEFAULT_ANSWERS):
+    """Erstellt eine Tabelle im Format von ``load_hitlisten_tables``."""
+    return pd.DataFrame(rows, columns=[CATEGORY_COLUMN, RESPONSES_COLUMN, *answers])
+
+
+@pytest.fixture
+def make_table():
+    """Fabrik für Hitlisten-Tabellen: ``make_table(rows, answers=...)``."""
+    return _make_table
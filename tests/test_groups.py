@@ -0,0 +1,68 @@
+"""Tests für GroupSizes und die darauf aufbauenden Analysefunktionen."""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+from rewe.data import GroupSizes, aggregate_groups, analyze_group_sizes
+from rewe.statistics import power_analysis, print_group_analysis
+from rewe.visualization import plot_group_comparison, print_comparison_stats
+
+
+SIZES = {"A": 12, "B": None, "C": 80, "D": 45, "E": 12}
+
+
+def test_group_sizes_sort_order_and_mask():
+    groups = GroupSizes.from_mapping(SIZES)
+
+    assert groups.sorted_items() == [("C", 80), ("D", 45), ("A", 12), ("E", 12)]
+    assert groups.total == 149
+    assert groups.small_groups(30) == [("A", 12), ("E", 12)]
+    assert groups.to_dict() == SIZES
+    assert groups["B"] is None and "B" in groups
+
+
+def test_analyze_group_sizes_handles_missing_values():
+    table = pd.DataFrame({"Question": ["n"], "A": ["12"], "B": ["-"], "C": [80.0]})
+
+    result = analyze_group_sizes(table, ["A", "B", "C"], threshold=30)
+
+    assert result["sizes"] == {"A": 12, "B": None, "C": 80}
+    assert result["sorted"] == [("C", 80), ("A", 12)]
+    assert result["small_groups"] == [("A", 12)]
+    assert isinstance(result["groups"], GroupSizes)
+
+
+def test_functions_accept_dict_and_group_sizes(capsys):
+    groups = GroupSizes.from_mapping(SIZES)
+
+    from_dict = power_analysis(SIZES)
+    from_groups = power_analysis(groups)
+    assert from_dict["powers"].keys() == from_groups["powers"].keys() == {"A", "C", "D", "E"}
+    np.testing.assert_allclose(from_dict["avg_power"], from_groups["avg_power"])
+    assert from_groups["ratings"]["C"] == "sehr_gut"
+
+    aggregated = aggregate_groups(groups, {"A": "AE", "E": "AE", "B": "B", "C": "C"})
+    assert aggregated == {"AE": 24, "C": 80}
+
+    print_group_analysis(groups)
+    print_comparison_stats(SIZES, GroupSizes.from_mapping(aggregated))
+    assert "Gesamt:" in capsys.readouterr().out
+
+    fig = plot_group_comparison(groups, aggregated)
+    assert len(fig.axes) == 2
+
+
+def test_dict_input_keeps_float_sizes_and_treats_nan_as_missing():
+    sizes = pd.Series({"A": 12.7, "B": np.nan, "C": 80.0}).to_dict()
+
+    groups = GroupSizes.from_mapping(sizes)
+    assert groups.to_dict() == {"A": 12.7, "B": None, "C": 80.0}
+    assert groups.sorted_items() == [("C", 80.0), ("A", 12.7)]
+
+    result = power_analysis(sizes)
+    assert result["powers"].keys() == {"A", "C"}
+    assert np.isfinite(result["avg_power"])
@@ -0,0 +1,79 @@
+"""Tests für inkrementelle Zählstände."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rewe.incremental import CountState
+from rewe.statistics import power_analysis
+
+MAPPING = {"IT": "IT & Daten", "HR": "Rest", "Vertrieb": "Rest"}
+
+
+@pytest.fixture
+def batches(make_table):
+    return (
+        make_table([["IT", 10, 2, 6, 1], ["HR", 4, 1, 2, "-"]]),
+        make_table([["HR", 2, 0, 1, 1], ["Vertrieb", 5, 4, 3, 0]]),
+    )
+
+
+def test_add_matches_full_rebuild(batches):
+    batch_1, batch_2 = batches
+    state = CountState.from_table(batch_1)
+    aggregated = state.track_aggregation("fach", MAPPING)
+    state.relative_values()
+    state.power_analysis()
+
+    state.add(batch_2)
+
+    full = CountState.from_table(pd.concat([batch_1, batch_2]))
+    assert state.categories == ["IT", "HR", "Vertrieb"]
+    np.testing.assert_array_equal(state.counts, full.counts)
+    np.testing.assert_array_equal(state.n, [10, 6, 5])
+    assert state.relative_values().loc["HR", "Fr. 3 - ca 11-30 Minuten"] == 0.5
+    assert state.power_analysis() == power_analysis(state.group_sizes())
+    assert aggregated.to_table().equals(full.aggregate(MAPPING).to_table())
+
+
+def test_subtract_removes_stale_batch(batches):
+    batch_1, batch_2 = batches
+    state = CountState.from_table(batch_1)
+    aggregated = state.track_aggregation("fach", MAPPING)
+    state.add(batch_2).subtract(batch_1)
+
+    assert state.group_sizes().to_dict() == {"IT": None, "HR": 2, "Vertrieb": 5}
+    assert aggregated.n.tolist() == [0, 7]
+    with pytest.raises(ValueError, match="Subtraktion ergibt negative"):
+        state.subtract(batch_1)
+
+
+def test_invalid_delta_leaves_state_unchanged(batches, make_table):
+    state = CountState.from_table(batches[0])
+    before = state.to_table()
+
+    with pytest.raises(ValueError, match="Addition: Delta enthält negative"):
+        state.add(make_table([["Neu", 3, -1, 0, 0]]))
+    with pytest.raises(ValueError, match="Subtraktion: Delta enthält unbekannte"):
+        state.subtract(make_table([["Neu", 3, 1, 0, 0]]))
+
+    assert state.categories == ["IT", "HR"]
+    assert state.to_table().equals(before)
+
+
+def test_relative_values_are_a_copy(batches):
+    state = CountState.from_table(batches[0])
+    relative = state.relative_values()
+    relative.iloc[:, :] = 0.0
+
+    state.add(batches[1])
+
+    assert relative.to_numpy().sum() == 0.0
+    assert state.relative_values().loc["IT", "Fr.1 - Übersetzen"] == 0.2
+
+
+def test_save_and_load_roundtrip(tmp_path, batches):
+    state = CountState.from_table(batches[0])
+    loaded = CountState.load(state.save(tmp_path / "state.npz"))
+
+    assert loaded.to_table().equals(state.to_table())
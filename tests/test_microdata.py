@@ -0,0 +1,106 @@
+"""Tests für den blockweisen Aufbau von Hitlisten-Tabellen aus Rohdaten."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rewe.data import analyze_group_sizes, table_to_long_format, transpose_group_table
+from rewe.microdata import build_hitlisten_tables
+
+
+@pytest.fixture
+def microdata():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    return pd.DataFrame({
+        "Gesellschaft": rng.choice(["REWE digital", "Penny", "Zentral"], n),
+        "q3": rng.choice(["bis 10 Minuten", "ca 11-30 Minuten", ">7 Stunden", None], n),
+        "q1": rng.choice(["Übersetzen;Korrekturlesen", "Übersetzen", "", None], n),
+    })
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_counts_match_crosstab(tmp_path, microdata, suffix):
+    path = tmp_path / f"rohdaten{suffix}"
+    if suffix == ".csv":
+        microdata.to_csv(path, index=False)
+    else:
+        pytest.importorskip("pyarrow")
+        microdata.to_parquet(path, index=False)
+
+    total, by_company = build_hitlisten_tables(
+        path,
+        group_columns=["Gesellschaft"],
+        question_columns={"q3": "Fr. 3", "q1": "Fr.1"},
+        answers={"q3": ["bis 10 Minuten", "ca 11-30 Minuten", ">7 Stunden"]},
+        multi_choice=["q1"],
+        chunksize=128,
+    )
+
+    expected = pd.crosstab(microdata["Gesellschaft"], microdata["q3"])
+    by_company = by_company.set_index("category")
+    for answer in expected.columns:
+        assert (by_company[f"Fr. 3 - {answer}"] == expected[answer].reindex(by_company.index)).all()
+
+    assert list(by_company.columns[:4]) == [
+        "Anzahl Antworten", "Fr. 3 - bis 10 Minuten", "Fr. 3 - ca 11-30 Minuten", "Fr. 3 - >7 Stunden"
+    ]
+    assert total["Anzahl Antworten"].tolist() == [len(microdata)]
+    assert total["Fr.1 - Übersetzen"].item() == microdata["q1"].str.contains("Übersetzen").sum()
+    assert by_company["Anzahl Antworten"].sum() == len(microdata)
+
+
+def test_tables_work_with_analysis_functions(tmp_path, microdata):
+    path = tmp_path / "rohdaten.csv"
+    microdata.to_csv(path, index=False)
+
+    _, by_company = build_hitlisten_tables(
+        path, group_columns=["Gesellschaft"], question_columns={"q3": "Fr. 3"}
+    )
+
+    transposed, names = transpose_group_table(by_company)
+    analysis = analyze_group_sizes(transposed, names)
+    assert analysis["total"] == len(microdata)
+
+    long, responses = table_to_long_format(by_company)
+    assert set(long["Question_Number"]) == {"Fr. 3"}
+    assert sum(responses.values()) == len(microdata)
+
+
+def test_csv_and_parquet_treat_empty_answers_alike(tmp_path):
+    pytest.importorskip("pyarrow")
+    data = pd.DataFrame({
+        "Gesellschaft": ["Penny", "Penny", ""],
+        "q3": ["ca 11-30 Minuten", "", ">7 Stunden"],
+    })
+    data.to_csv(tmp_path / "rohdaten.csv", index=False)
+    data.to_parquet(tmp_path / "rohdaten.parquet", index=False)
+
+    options = dict(group_columns=["Gesellschaft"], question_columns={"q3": "Fr. 3"})
+    from_csv = build_hitlisten_tables(tmp_path / "rohdaten.csv", **options)
+    from_parquet = build_hitlisten_tables(tmp_path / "rohdaten.parquet", **options)
+
+    for csv_table, parquet_table in zip(from_csv, from_parquet):
+        pd.testing.assert_frame_equal(csv_table, parquet_table)
+    assert "Fr. 3 - " not in from_parquet[0].columns
+    assert from_parquet[1]["category"].tolist() == ["Penny"]
+
+
+def test_parquet_integer_answers_do_not_depend_on_batches(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    # Ohne pandas-Metadaten; mit chunksize=2 enthält nur der zweite Block einen Nullwert
+    table = pa.table({
+        "Gesellschaft": pa.array(["Penny", "Penny", "Penny", "Penny"]),
+        "q9": pa.array([1, 2, None, 1], type=pa.int64()),
+    })
+    path = tmp_path / "rohdaten.parquet"
+    pq.write_table(table, path)
+    options = dict(group_columns=["Gesellschaft"], question_columns={"q9": "Fr. 9"}, chunksize=2)
+
+    tables = build_hitlisten_tables(path, **options)
+    fixed = build_hitlisten_tables(path, answers={"q9": ["1", "2"]}, **options)
+
+    assert list(tables[0].columns[2:]) == ["Fr. 9 - 1", "Fr. 9 - 2"]
+    assert tables[0].iloc[0, 2:].tolist() == [2, 1]
+    assert fixed[1].iloc[0, 2:].tolist() == [2, 1]
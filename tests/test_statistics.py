@@ -0,0 +1,133 @@
+"""Tests für die Anpassung von Verteilungen an klassierte Zeitangaben."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from rewe.statistics import fit_interval_censored, fit_time_distributions, time_bin_edges
+
+# Antworttexte wie in der Arbeitsmappe
+FR3_LABELS = [
+    "Fr. 3 - ca. 1-10 Minuten",
+    "Fr. 3 - ca 11-30 Minuten",
+    "Fr. 3 - ca 31-60 Minuten",
+    "Fr. 3 - ca 61-120 Minuten (1-2 Stunden)",
+    "Fr. 3 - ca 121-180 Minuten (2-3 Stunden)",
+    "Fr. 3 - ca 181-240 Minuten (3-4 Stunden)",
+    "Fr. 3 - ca 241-300 Minuten (4-5 Stunden)",
+    "Fr. 3 - ca 301-360 Minuten (5-6 Stunden)",
+    "Fr. 3 - ca 361-420 Minuten (6-7 Stunden)",
+    "Fr. 3 - >7 Stunden",
+]
+FR5_LABELS = [
+    "Fr. 5 - 0 Minuten",
+    "Fr. 5 - 1-10 Minuten",
+    "Fr. 5 - 11-30 Minuten",
+    "Fr. 5 - 31-60 Minuten",
+    "Fr. 5 - 61-120 Minuten (1-2 Stunden)",
+    "Fr. 5 - 121-180 Minuten (2-3 Stunden)",
+    "Fr. 5 - 181-240 Minuten (3-4 Stunden)",
+    "Fr. 5 - 241-300 Minuten (4-5 Stunden)",
+    "Fr. 5 - >5 Stunden",
+]
+# Fr. 5 der Gesamttabelle (n = 359)
+FR5_TOTAL = [11, 17, 40, 67, 90, 66, 34, 15, 19]
+
+
+def test_time_bin_edges_fr3():
+    lower, upper = time_bin_edges(FR3_LABELS)
+
+    np.testing.assert_array_equal(lower, [0, 10, 30, 60, 120, 180, 240, 300, 360, 420])
+    np.testing.assert_array_equal(upper, [10, 30, 60, 120, 180, 240, 300, 360, 420, np.inf])
+
+
+def test_time_bin_edges_fr5_keeps_zero_class():
+    lower, upper = time_bin_edges(FR5_LABELS)
+
+    np.testing.assert_array_equal(lower, [0, 1, 10, 30, 60, 120, 180, 240, 300])
+    np.testing.assert_array_equal(upper, [1, 10, 30, 60, 120, 180, 240, 300, np.inf])
+
+
+def test_time_bin_edges_unknown_label():
+    lower, upper = time_bin_edges(["Fr. 3 - keine Angabe"])
+    assert np.isnan(lower[0]) and np.isnan(upper[0])
+
+
+def test_fit_recovers_lognormal_parameters():
+    rng = np.random.default_rng(0)
+    lower = np.array([0, 10, 30, 60, 120, 180, 420.0])
+    upper = np.append(lower[1:], np.inf)
+    mus, sigmas = np.array([3.8, 4.4]), np.array([0.7, 1.1])
+    counts = np.array([
+        np.histogram(rng.lognormal(mu, sigma, 5_000), bins=np.append(lower, np.inf))[0]
+        for mu, sigma in zip(mus, sigmas)
+    ] + [np.zeros(len(lower))])
+
+    result = fit_interval_censored(counts, lower, upper, groups=["a", "b", "leer"])
+
+    best = result[result["best"]].set_index("group")
+    assert (best["distribution"] == "lognormal").all()
+    np.testing.assert_allclose(best["param_1"], mus, atol=0.05)
+    np.testing.assert_allclose(best["param_2"], sigmas, atol=0.05)
+    np.testing.assert_allclose(best["q0.5"], np.exp(mus), rtol=0.06)
+    assert result.loc[result["group"] == "leer", "aic"].isna().all()
+    assert result.loc[result["group"] != "leer", "converged"].all()
+
+
+def test_fit_time_distributions_uses_all_fr5_respondents(make_table):
+    table = make_table([["Gesamt", 359, *FR5_TOTAL]], FR5_LABELS)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = fit_time_distributions(table, "Fr. 5")
+
+    lognormal = result[result["distribution"] == "lognormal"].iloc[0]
+    assert np.isfinite(lognormal["aic"])
+    # Die Nullklasse zieht die Verteilung nach unten: Median unter dem Klassenmedian
+    assert 30 < lognormal["q0.5"] < 120
+
+
+def test_fit_time_distributions_from_table(make_table):
+    table = make_table(
+        [["IT", 20, 5, 8, 4, 2, 1, 0, 0, 0, 0, 0], ["HR", 10, 1, 3, 3, 2, 1, 0, 0, 0, 0, 0]],
+        FR3_LABELS,
+    )
+
+    result = fit_time_distributions(table, "Fr.3", distributions=("gamma", "normal"))
+
+    assert set(result["group"]) == {"IT", "HR"}
+    assert set(result["distribution"]) == {"gamma", "normal"}
+    assert result["best"].sum() == 2
+
+
+def test_fit_time_distributions_warns_about_dropped_columns(make_table):
+    table = make_table(
+        [["IT", 20, 5, 8, 4]],
+        ["Fr. 3 - ca. 1-10 Minuten", "Fr. 3 - ca 11-30 Minuten", "Fr. 3 - keine Angabe"],
+    )
+
+    with pytest.warns(UserWarning, match="keine Angabe"):
+        fit_time_distributions(table, "Fr. 3")
+
+
+def test_degenerate_groups_are_flagged_and_order_is_kept(make_table):
+    table = make_table(
+        [
+            ["one_bin", 10, 0, 0, 10, 0, 0, 0, 0, 0, 0, 0],
+            ["open", 4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4],
+            ["ok", 20, 5, 8, 4, 2, 1, 0, 0, 0, 0, 0],
+        ],
+        FR3_LABELS,
+    )
+
+    with pytest.warns(UserWarning, match="nur einer Klasse: \\['one_bin', 'open'\\]"):
+        result = fit_time_distributions(table, "Fr. 3")
+
+    assert list(dict.fromkeys(result["group"])) == ["one_bin", "open", "ok"]
+    flagged = result[result["degenerate"]]
+    assert set(flagged["group"]) == {"one_bin", "open"}
+    assert flagged[["param_1", "param_2", "aic", "q0.5"]].isna().all().all()
+    assert not flagged["best"].any() and not flagged["converged"].any()
+    ok = result[result["group"] == "ok"]
+    assert ok["converged"].all() and ok["best"].sum() == 1
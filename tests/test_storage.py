@@ -0,0 +1,62 @@
+"""Tests für das partitionierte Parquet-Dataset."""
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from rewe.data import table_to_long_format
+from rewe.storage import (
+    hitlisten_to_long_format,
+    read_processed_dataset,
+    write_processed_dataset,
+)
+
+ANSWERS = ("Fr.1 - Übersetzen", "Fr. 5 - 1-10 Minuten")
+
+
+@pytest.fixture
+def tables(make_table):
+    return [
+        make_table([["Gesamt", 10, 4, 6]], ANSWERS),
+        make_table([["IT & Daten", 6, 3, 2], ["HR", 4, 1, 4]], ANSWERS),
+    ]
+
+
+def test_table_to_long_format(tables):
+    long, responses = table_to_long_format(tables[1])
+
+    assert responses == {"IT & Daten": 6, "HR": 4}
+    assert long["Category"].tolist() == ["IT & Daten", "IT & Daten", "HR", "HR"]
+    assert long["Question_Number"].tolist() == ["Fr.1", "Fr. 5", "Fr.1", "Fr. 5"]
+    assert long["Relative_Value"].tolist() == [0.5, 2 / 6, 0.25, 1.0]
+
+
+def test_write_and_read_with_filters(tmp_path, tables):
+    root = write_processed_dataset(tables, "251105", root=tmp_path)
+    assert (root / "snapshot=251105" / "table=1" / "question=5").is_dir()
+
+    result = read_processed_dataset(
+        root=root,
+        columns=["Category", "Value"],
+        filters=[("question", "=", 5), ("Category", "=", "HR")],
+    )
+    assert result.to_dict("records") == [{"Category": "HR", "Value": 4.0}]
+
+    # Erneuter Export ersetzt denselben Snapshot, statt Zeilen zu duplizieren
+    write_processed_dataset(tables, "251105", root=root)
+    assert len(read_processed_dataset(root=root)) == 6
+
+    # Entfallene Fragen hinterlassen keine veralteten Partitionen
+    write_processed_dataset([t.iloc[:, :3] for t in tables], "251105", root=root)
+    result = read_processed_dataset(root=root)
+    assert set(result["question"]) == {1}
+    assert len(result) == 3
+
+    # Andere Snapshots bleiben erhalten
+    write_processed_dataset(tables, "251201", root=root)
+    assert len(read_processed_dataset(root=root, filters=[("snapshot", "=", "251105")])) == 3
+
+
+def test_long_format_rejects_empty_tables():
+    with pytest.raises(ValueError, match="Keine Tabellen"):
+        hitlisten_to_long_format([])
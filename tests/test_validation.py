@@ -0,0 +1,90 @@
+"""Tests für die Konsistenzprüfung der Hitlisten-Tabellen."""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from rewe.data import load_hitlisten_tables, load_hitlisten_workbook
+from rewe.validation import (
+    HitlistenValidationError,
+    HitlistenValidationWarning,
+    validate_hitlisten_tables,
+)
+
+HEADER = [[None, "Anzahl", "Fr.1 -"], [None, "Antworten", "Übersetzen"]]
+OPTIONS = dict(header_row_span=(0, 2), expected_tables=1)
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Arbeitsmappe mit einem konsistenten und einem fehlerhaften Blatt."""
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "hitlisten.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(HEADER + [["IT", 6, 3]]).to_excel(
+            writer, sheet_name="Gesellschaft", header=False, index=False
+        )
+        pd.DataFrame(HEADER + [["IT", 6, 9]]).to_excel(
+            writer, sheet_name="Alter", header=False, index=False
+        )
+    return path
+
+
+def test_consistent_tables_have_empty_report(make_table):
+    tables = [make_table([["Gesamt", 10, 8, 6, 4]]), make_table([["IT", 6, 5, 3, 3], ["HR", 4, 3, 3, pd.NA]])]
+
+    assert validate_hitlisten_tables(tables).empty
+
+
+def test_report_lists_all_violations(make_table):
+    tables = [
+        make_table([["Gesamt", 10, 12, 6, 4]]),
+        make_table([["IT", 6, -1, 4, 3], ["HR", None, 1, 1, 0], ["Vertrieb", 5, 2.5, 1, 1]]),
+    ]
+
+    report = validate_hitlisten_tables(tables)
+
+    found = set(zip(report["table"], report["category"], report["rule"]))
+    assert found == {
+        (0, "Gesamt", "count_exceeds_n"),
+        (1, "IT", "negative_count"),
+        (1, "IT", "single_choice_sum_exceeds_n"),
+        (1, "HR", "invalid_n"),
+        (1, "Vertrieb", "non_integer_count"),
+    }
+    row = report[report["rule"] == "single_choice_sum_exceeds_n"].iloc[0]
+    assert (row["question"], row["value"], row["limit"]) == ("Fr. 3", 7, 6)
+
+
+def test_load_warns_by_default_with_report(workbook):
+    with pytest.warns(HitlistenValidationWarning, match="count_exceeds_n") as record:
+        load_hitlisten_tables(workbook, sheet_name="Alter", **OPTIONS)
+
+    report = record[0].message.report
+    assert report["rule"].tolist() == ["count_exceeds_n"]
+    assert record[0].filename == __file__
+
+
+def test_strict_load_fails_fast(workbook):
+    with pytest.raises(HitlistenValidationError) as excinfo:
+        load_hitlisten_tables(workbook, sheet_name="Alter", validation="strict", **OPTIONS)
+    assert excinfo.value.report["rule"].tolist() == ["count_exceeds_n"]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        load_hitlisten_tables(workbook, sheet_name="Alter", validation=None, **OPTIONS)
+
+
+def test_workbook_report_names_sheets(workbook):
+    with pytest.warns(HitlistenValidationWarning) as record:
+        load_hitlisten_workbook(workbook, **OPTIONS)
+    report = record[0].message.report
+    assert report.columns[0] == "sheet"
+    assert report[["sheet", "category", "rule"]].values.tolist() == [
+        ["Alter", "IT", "count_exceeds_n"]
+    ]
+
+    with pytest.raises(HitlistenValidationError, match="Alter") as excinfo:
+        load_hitlisten_workbook(workbook, validation="strict", **OPTIONS)
+    assert excinfo.value.report["sheet"].tolist() == ["Alter"]
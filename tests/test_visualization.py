@@ -0,0 +1,65 @@
+"""Tests für die Small-Multiples-Übersicht."""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rewe.visualization import plot_question_overview
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(0)
+    columns = [f"Fr.{q} - Antwort {a}" for q in range(1, 14) for a in range(1, 6)]
+    data = pd.DataFrame(rng.integers(0, 30, (6, len(columns))), columns=columns)
+    data.insert(0, "Anzahl Antworten", 30)
+    data.insert(0, "category", [f"Gruppe {i}" for i in range(6)])
+    return data
+
+
+@pytest.mark.parametrize("kind", ["heatmap", "bars"])
+def test_one_collection_per_panel(table, kind):
+    fig = plot_question_overview(table, kind=kind, ncols=5)
+
+    panels = [ax for ax in fig.axes if ax.get_visible() and ax.get_title()]
+    assert [ax.get_title() for ax in panels] == [f"Fr. {q}" for q in range(1, 14)]
+    for ax in panels:
+        assert len(ax.collections) == 1
+        assert not ax.patches and not ax.texts
+
+
+def test_question_selection(table):
+    fig = plot_question_overview(table, questions=["Fr. 5", "Fr.3"], ncols=2)
+    titles = [ax.get_title() for ax in fig.axes if ax.get_title()]
+    assert titles == ["Fr. 5", "Fr. 3"]
+
+    with pytest.raises(ValueError, match="nicht in der Tabelle"):
+        plot_question_overview(table, questions=["Fr. 99"])
+
+
+@pytest.mark.parametrize("question", ["foo", "Frage 3", ""])
+def test_unparseable_question_is_reported(table, question):
+    with pytest.raises(ValueError, match="Fragen nicht in der Tabelle gefunden"):
+        plot_question_overview(table, questions=[question])
+
+
+@pytest.mark.parametrize("kind", ["heatmap", "bars"])
+def test_rows_without_valid_n_are_skipped(kind):
+    table = pd.DataFrame({
+        "category": ["IT", "HR", "Vertrieb"],
+        "Anzahl Antworten": [5, 0, "-"],
+        "Fr.1 - Übersetzen": [2, 3, 1],
+        "Fr.1 - Korrekturlesen": [4, 1, 2],
+    })
+
+    fig = plot_question_overview(table, kind=kind)
+
+    artist = fig.axes[0].collections[0]
+    if kind == "heatmap":
+        assert artist.norm.vmax == pytest.approx(0.8)
+    else:
+        assert fig.axes[0].get_ylim()[1] == pytest.approx(0.8 * 1.05)
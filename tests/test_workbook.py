@@ -0,0 +1,68 @@
+"""Tests für das Laden von Hitlisten-Arbeitsmappen mit mehreren Blättern."""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from rewe.data import load_hitlisten_tables, load_hitlisten_workbook
+
+HEADER = [[None, "Anzahl", "Fr.1 -"], [None, "Antworten", "Übersetzen"]]
+TOTAL = [["Gesamt", 10, 4]]
+GROUPS = [["IT", 6, 3], ["HR", 4, "-"]]
+BLANK = [[None, None, None]]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "hitlisten.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(HEADER + TOTAL + BLANK + GROUPS).to_excel(
+            writer, sheet_name="Gesellschaft", header=False, index=False
+        )
+        pd.DataFrame([["Hinweis"], ["Nur Text"]]).to_excel(
+            writer, sheet_name="Info", header=False, index=False
+        )
+        pd.DataFrame([[None] * 3] + HEADER + GROUPS).to_excel(
+            writer, sheet_name="Alter", header=False, index=False
+        )
+    return path
+
+
+def test_load_workbook_discovers_sheets_with_overrides(workbook):
+    sheets = load_hitlisten_workbook(
+        workbook,
+        header_row_span=(0, 2),
+        expected_tables=2,
+        sheet_options={"Alter": {"header_row_span": (1, 3), "expected_tables": 1}},
+    )
+
+    assert list(sheets) == ["Gesellschaft", "Alter"]
+    total, groups = sheets["Gesellschaft"]
+    assert list(total.columns) == ["category", "Anzahl Antworten", "Fr.1 - Übersetzen"]
+    assert groups["category"].tolist() == ["IT", "HR"]
+    assert pd.isna(groups["Fr.1 - Übersetzen"].iloc[1])
+    assert sheets["Alter"][0].equals(groups)
+
+
+def test_load_workbook_rejects_unknown_sheets(workbook):
+    with pytest.raises(ValueError, match="nicht gefunden"):
+        load_hitlisten_workbook(workbook, sheet_names=["Fehlt"])
+
+
+def test_load_hitlisten_tables_selects_sheet(workbook):
+    tables = load_hitlisten_tables(
+        workbook, sheet_name="Alter", header_row_span=(1, 3), expected_tables=1
+    )
+    assert tables[0]["Anzahl Antworten"].tolist() == [6, 4]
+
+
+def test_load_workbook_rejects_options_for_unloaded_sheets(workbook):
+    with pytest.raises(ValueError, match="nicht geladene"):
+        load_hitlisten_workbook(
+            workbook,
+            sheet_names=["Gesellschaft"],
+            header_row_span=(0, 2),
+            expected_tables=2,
+            sheet_options={"Alter": {"expected_tables": 1}},
+        )